@@ -0,0 +1,68 @@
+"""
+Benchmark decoding getData replies with each installed JSON codec.
+
+Run with: uv run python benchmarks/codec.py
+"""
+
+import json
+import timeit
+from collections.abc import Callable
+from dataclasses import fields, make_dataclass
+
+from exoyone.codec import CODECS
+from exoyone.state import ExoyOneState
+
+REPLY = (
+    b'{"mdnsName": "exoyone-a1b2c3", "type": 4, "brightness": 200,'
+    b' "currentModpack": 3, "modeIndex": 7, "speed": 10, "hue": 128,'
+    b' "saturation": 255, "autoChange": false, "musicSync": false,'
+    b' "fadingOff": true, "buttonEnabled": true, "sceneGeneration": false,'
+    b' "lockColorWheel": false, "forceMusicSync": false, "selectedPattern": 1,'
+    b' "selectedRenderMode": 0, "selectedColorMode": 0, "selectedPalette": 2,'
+    b' "userDefinedName": "Living Room", "cycleSpeed": 5, "shutdownTimer": 0,'
+    b' "direction": false, "connectedToWiFi": true,'
+    b' "firmwareVersion": "1.2.3", "poweredByPowerbank": false}'
+)
+REQUEST = {"setHue": 128, "setSaturation": 255, "setBrightness": 200}
+FLEET_SIZE = 1000
+ROUNDS = 20
+
+# The state as it was before it became frozen and slotted: a plain dataclass
+# with the same fields, so the baseline does not pay for the frozen __init__.
+LegacyState = make_dataclass(
+    "LegacyState",
+    [
+        (state_field.name, state_field.type)
+        for state_field in fields(ExoyOneState)
+        if state_field.compare
+    ],
+)
+
+
+def _best(operation: Callable[[], object]) -> float:
+    """Return the fastest time to run an operation once per fleet device."""
+    return min(timeit.repeat(operation, number=FLEET_SIZE, repeat=ROUNDS))
+
+
+def _legacy_decode() -> object:
+    """Decode a reply the way ExoyOne did before codecs were pluggable."""
+    return LegacyState(**json.loads(REPLY.decode("utf-8")))
+
+
+def main() -> None:
+    """Print the time per fleet-wide poll for each codec."""
+    baseline = _best(_legacy_decode)
+    print(f"Decoding {FLEET_SIZE} replies and encoding {FLEET_SIZE} requests:")
+    print(f"{'legacy':>8}: decode {baseline * 1000:6.2f} ms")
+    for name, codec in CODECS.items():
+        decode = _best(lambda codec=codec: ExoyOneState.from_reply(codec.decode(REPLY)))
+        encode = _best(lambda codec=codec: codec.encode(REQUEST))
+        print(
+            f"{name:>8}: decode {decode * 1000:6.2f} ms "
+            f"({baseline / decode:.1f}x the legacy speed), "
+            f"encode {encode * 1000:5.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
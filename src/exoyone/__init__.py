@@ -1,23 +1,44 @@
 __version__ = "1.0.13rc.1"
 
+from .batch import ExoyOneBatch
+from .coordinator import ExoyOneCoordinator
+from .deadline import ExoyOneDeadline
+from .discovery import ExoyOneDiscovery, ExoyOneDiscoveryRecord
 from .exoyone import ExoyOne
+from .fleet import ExoyOneFleet
 from .models import (
     ExoyOneAssertionError,
     ExoyOneException,
+    ExoyOnePriority,
     ExoyOneTimeoutError,
+    ExoyOneUnavailableError,
     ExoyOneValueError,
     mode_packs,
 )
 from .models import ModePacks as ExoyOneModePacks
+from .scenes import ExoyOneScene
+from .scheduler import ExoyOneScheduler
 from .state import ExoyOneState
+from .writes import ExoyOneWrite
 
 __all__ = [
     "ExoyOne",
     "ExoyOneAssertionError",
+    "ExoyOneBatch",
+    "ExoyOneCoordinator",
+    "ExoyOneDeadline",
+    "ExoyOneDiscovery",
+    "ExoyOneDiscoveryRecord",
     "ExoyOneException",
+    "ExoyOneFleet",
     "ExoyOneModePacks",
+    "ExoyOnePriority",
+    "ExoyOneScene",
+    "ExoyOneScheduler",
     "ExoyOneState",
     "ExoyOneTimeoutError",
+    "ExoyOneUnavailableError",
     "ExoyOneValueError",
+    "ExoyOneWrite",
     "mode_packs",
 ]
@@ -0,0 +1,116 @@
+"""Apply many ExoyOne settings in a single request."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .exoyone import ExoyOne
+    from .models import ExoyOneRequest
+
+_LOGGER = logging.getLogger(__package__)
+
+_active_batch: ContextVar[ExoyOneBatch | None] = ContextVar(
+    "exoyone_batch", default=None
+)
+
+
+def active_batch(device: ExoyOne) -> ExoyOneBatch | None:
+    """Return the batch open for a device in the current context, if any."""
+    batch = _active_batch.get()
+    while batch is not None and batch.device is not device:
+        batch = batch._outer
+    return batch
+
+
+class ExoyOneBatch:
+    """
+    Collect settings and send them as one request on exit.
+
+    Any ExoyOne method can be called on the batch. Settings made within the
+    block, by the task that opened it or tasks it starts, are merged with the
+    latest value for each key winning, then sent as a single request followed
+    by a single read. Nothing is sent if the block raises.
+    """
+
+    def __init__(self, exoyone: ExoyOne, optimistic: bool | None = None) -> None:
+        """Initialize an empty batch."""
+        self._exoyone = exoyone
+        self._optimistic = optimistic
+        self._request: dict[str, Any] = {}
+        self._confirmation: asyncio.Future[bool] | None = None
+        self._outer: ExoyOneBatch | None = None
+        self._token: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the attribute from the ExoyOne, so its setters are batched."""
+        return getattr(self._exoyone, name)
+
+    async def __aenter__(self) -> Self:
+        """Start collecting settings."""
+        self._confirmation = asyncio.get_running_loop().create_future()
+        self._outer = _active_batch.get()
+        self._token = _active_batch.set(self)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Send the collected settings, unless the block raised."""
+        _active_batch.reset(self._token)
+        confirmation = self.confirmation
+        if exc_type is not None:
+            confirmation.cancel()
+            return
+        if not self._request:
+            confirmation.set_result(True)
+            return
+
+        try:
+            written = await self._exoyone.async_set_data(
+                self._request, optimistic=self._optimistic
+            )
+        except BaseException:
+            confirmation.cancel()
+            raise
+        written.add_done_callback(self._resolve)
+
+    @property
+    def device(self) -> ExoyOne:
+        """Return the ExoyOne the batch collects settings for."""
+        return self._exoyone
+
+    @property
+    def request(self) -> dict[str, Any]:
+        """Return the settings collected so far."""
+        return dict(self._request)
+
+    @property
+    def confirmation(self) -> asyncio.Future[bool]:
+        """Return a future that resolves to True once the batch is confirmed."""
+        if self._confirmation is None:
+            raise RuntimeError("Batch has not been started")
+        return self._confirmation
+
+    def add(self, request: ExoyOneRequest) -> asyncio.Future[bool]:
+        """Merge a request into the batch and return the batch confirmation."""
+        self._request.update(request)
+        return self.confirmation
+
+    def _resolve(self, written: asyncio.Future[bool]) -> None:
+        """Pass the result of the batched write on to the batch confirmation."""
+        confirmation = self.confirmation
+        if confirmation.done():
+            return
+        if written.cancelled():
+            confirmation.cancel()
+        else:
+            confirmation.set_result(written.result())
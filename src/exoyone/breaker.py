@@ -0,0 +1,72 @@
+"""Circuit breaking and availability tracking for an ExoyOne."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import ClassVar
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass
+class Availability:
+    """Whether a device is reachable, and how quickly it replies."""
+
+    available: bool = True
+    latency: float | None = None
+    failures: int = 0
+    trips: int = 0
+    last_seen: float | None = None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tripped by consecutive reads that get no reply.
+
+    Once threshold reads in a row have failed the breaker opens and the
+    device is marked unavailable until a read succeeds again. With no
+    threshold the breaker never opens but availability is still tracked. The
+    latency of every reply is tracked as an exponential moving average.
+    """
+
+    ALPHA: ClassVar[float] = 0.2
+
+    def __init__(self, threshold: int | None) -> None:
+        """Initialize a closed breaker."""
+        self._threshold = threshold
+        self.stats = Availability()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests should fail without being sent."""
+        return not self.stats.available
+
+    def record_success(self, latency: float) -> bool:
+        """Record a reply and return True if it closed the breaker."""
+        stats = self.stats
+        stats.latency = (
+            latency
+            if stats.latency is None
+            else stats.latency + self.ALPHA * (latency - stats.latency)
+        )
+        stats.last_seen = time.monotonic()
+        stats.failures = 0
+        closed = not stats.available
+        stats.available = True
+        return closed
+
+    def record_failure(self) -> bool:
+        """Record a read that got no reply and return True if it tripped."""
+        stats = self.stats
+        stats.failures += 1
+        if (
+            self._threshold is not None
+            and stats.available
+            and stats.failures >= self._threshold
+        ):
+            stats.available = False
+            stats.trips += 1
+            return True
+        return False
@@ -1,11 +1,17 @@
 """ExoyOne CLI interface."""
 
 import logging
+from pathlib import Path
+from typing import Annotated
 
+import rich
 import typer
+from rich import box
+from rich.table import Table
 from typer import Typer
 
 from . import get, set
+from . import helpers as hp
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -16,6 +22,30 @@ app.add_typer(get.app, name="get")
 app.add_typer(set.app, name="set")
 
 
+@app.command()
+def discover(
+    timeout: Annotated[
+        float,
+        typer.Option(
+            "--timeout",
+            "-t",
+            help="Number of seconds to browse for devices.",
+            min=0,
+        ),
+    ] = 3.0,
+) -> None:
+    """Discover ExoyOne devices on the local network."""
+    cache_path = Path(typer.get_app_dir(APP_NAME)) / "devices.json"
+    records = hp.discover_devices(cache_path, timeout)
+
+    table = Table(box=box.SIMPLE_HEAD, highlight=True)
+    table.add_column("mDNS Name")
+    table.add_column("Host")
+    for record in sorted(records, key=lambda record: record.mdns_name):
+        table.add_row(record.mdns_name, record.host)
+    rich.print(table)
+
+
 @app.callback()
 def cli() -> None:
     """ExoyOne Command-Line Interface (CLI)."""
@@ -5,11 +5,13 @@ from __future__ import annotations
 import asyncio
 import colorsys
 from enum import StrEnum
+from pathlib import Path
 
 import rich
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .. import ExoyOne
+from ..discovery import ExoyOneDiscovery, ExoyOneDiscoveryRecord
 
 
 def hsb_to_rgb(hue: int, saturation: int, brightness: int) -> tuple[int, int, int]:
@@ -72,12 +74,13 @@ def send_request_with_progress(
             task = progress.add_task(description, total=1)
 
             try:
-                func = getattr(exoyone, method_to_call)
-                await func(value)
-                while not progress.finished:
-                    if getattr(exoyone.state, key_to_check) == to_check:
-                        progress.update(task, completed=1)
-                    await asyncio.sleep(0.2)
+                async with exoyone:
+                    func = getattr(exoyone, method_to_call)
+                    await func(value)
+                    while not progress.finished:
+                        if getattr(exoyone.state, key_to_check) == to_check:
+                            progress.update(task, completed=1)
+                        await asyncio.sleep(0.2)
 
             except AttributeError:
                 return
@@ -98,7 +101,8 @@ def get_exoyone(host: str) -> ExoyOne:
             transient=True,
         ) as progress:
             task = progress.add_task(f"Connecting to {exoyone.host}...", total=1)
-            await exoyone.async_get_data()
+            async with exoyone:
+                await exoyone.async_get_data()
 
             while not progress.finished:
                 if exoyone.state.currentModpack > -1:
@@ -107,3 +111,21 @@ def get_exoyone(host: str) -> ExoyOne:
 
     asyncio.run(_async_get())
     return exoyone
+
+
+def discover_devices(cache_path: Path, timeout: float) -> list[ExoyOneDiscoveryRecord]:
+    """Browse for ExoyOne devices, starting from the cached index."""
+
+    async def _async_discover() -> list[ExoyOneDiscoveryRecord]:  # pragma: no cover
+        """Browse for devices until the timeout expires."""
+        async with ExoyOneDiscovery(cache_path=cache_path) as discovery:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                transient=True,
+            ) as progress:
+                progress.add_task("Discovering ExoyOne devices...", total=None)
+                await asyncio.sleep(timeout)
+            return list(discovery.devices.values())
+
+    return asyncio.run(_async_discover())
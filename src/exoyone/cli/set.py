@@ -24,7 +24,13 @@ app = typer.Typer(no_args_is_help=True)
 def restart_in_ap_mode(ctx: typer.Context) -> None:
     """Restart the ExoyOne to enable Wi-Fi access point."""
     exoyone = hp.get_exoyone(ctx.obj.host)
-    asyncio.run(exoyone.restart_in_ap_mode())
+
+    async def _restart() -> None:  # pragma: no cover
+        """Send the restart request and close the endpoint."""
+        async with exoyone:
+            await exoyone.restart_in_ap_mode()
+
+    asyncio.run(_restart())
 
 
 @app.command("color")
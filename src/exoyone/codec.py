@@ -0,0 +1,76 @@
+"""JSON encoding and decoding of ExoyOne datagrams."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .models import ExoyOneValueError
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass(frozen=True)
+class ExoyOneCodec:
+    """
+    A JSON codec that encodes to and decodes from bytes.
+
+    Native codecs are compiled extensions that encode small requests faster
+    than they can be looked up in a cache.
+    """
+
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+    native: bool = False
+
+
+def _json_encode(obj: Any) -> bytes:
+    """Encode an object with the standard library."""
+    return json.dumps(obj).encode("utf-8")
+
+
+def _load_codecs() -> dict[str, ExoyOneCodec]:
+    """Return the installed codecs, fastest first."""
+    codecs: dict[str, ExoyOneCodec] = {}
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        codecs["orjson"] = ExoyOneCodec(
+            "orjson", orjson.dumps, orjson.loads, native=True
+        )
+
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+        codecs["msgspec"] = ExoyOneCodec(
+            "msgspec", encoder.encode, decoder.decode, native=True
+        )
+
+    # json.loads accepts UTF-8 bytes directly.
+    codecs["json"] = ExoyOneCodec("json", _json_encode, json.loads)
+    return codecs
+
+
+CODECS = _load_codecs()
+
+
+def get_codec(name: str | None = None) -> ExoyOneCodec:
+    """Return an installed codec by name, or the fastest one if no name is given."""
+    if name is None:
+        return next(iter(CODECS.values()))
+    try:
+        return CODECS[name]
+    except KeyError as exc:
+        raise ExoyOneValueError(
+            f"JSON codec {name} is not installed. Installed: {', '.join(CODECS)}"
+        ) from exc
@@ -0,0 +1,134 @@
+"""Pre-encoded ExoyOne commands."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator, Mapping
+from typing import ClassVar
+
+from .codec import ExoyOneCodec
+from .models import ExoyOneRequest
+
+_LOGGER = logging.getLogger(__package__)
+
+# Encoded in place of each value to find where values go in a template.
+_PLACEHOLDER = -918273645
+_PLACEHOLDER_BYTES = b"%d" % _PLACEHOLDER
+
+
+class ExoyOneCommand(Mapping[str, Mapping[str, int | str] | bool | int | str]):
+    """An immutable request with its payload encoded once."""
+
+    __slots__ = ("_payload", "_request")
+
+    def __init__(self, request: ExoyOneRequest, payload: bytes) -> None:
+        """Initialize the command from a request and its encoded payload."""
+        self._request = dict(request)
+        self._payload = payload
+
+    @property
+    def payload(self) -> bytes:
+        """Return the encoded payload."""
+        return self._payload
+
+    def __getitem__(self, key: str) -> Mapping[str, int | str] | bool | int | str:
+        """Return the value of a request key."""
+        return self._request[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the request keys."""
+        return iter(self._request)
+
+    def __len__(self) -> int:
+        """Return the number of request keys."""
+        return len(self._request)
+
+    def __repr__(self) -> str:
+        """Return the command as its request."""
+        return f"ExoyOneCommand({self._request!r})"
+
+
+class ExoyOneCommands:
+    """
+    Build pre-encoded commands for a codec.
+
+    Single-key commands are cached, so constant commands like
+    {"togglePower": 1} are only ever encoded once. Commands whose values are
+    all integers are built from a per-key template rather than encoded.
+    Requests are encoded directly when the codec is a native extension, as
+    it encodes faster than a cache lookup; commands are still reused as is.
+    """
+
+    MAX_CACHED: ClassVar[int] = 4096
+
+    def __init__(self, codec: ExoyOneCodec) -> None:
+        """Initialize an empty command cache."""
+        self._codec = codec
+        self._cache: dict[tuple[str, type, object], ExoyOneCommand] = {}
+        self._templates: dict[tuple[str, ...], bytes | None] = {}
+
+    def command(self, request: ExoyOneRequest) -> ExoyOneCommand:
+        """Return the command for a request, from the cache if possible."""
+        if type(request) is ExoyOneCommand:
+            return request
+        if len(request) != 1:
+            return ExoyOneCommand(request, self._encode(request))
+
+        ((key, value),) = request.items()
+        if isinstance(value, Mapping):
+            return ExoyOneCommand(request, self._codec.encode(request))
+
+        # bool is an int subclass, so the type keeps True and 1 apart.
+        cache_key = (key, type(value), value)
+        command = self._cache.get(cache_key)
+        if command is None:
+            command = ExoyOneCommand(request, self._encode(request))
+            if len(self._cache) < self.MAX_CACHED:
+                self._cache[cache_key] = command
+        return command
+
+    def encode(self, request: ExoyOneRequest) -> bytes:
+        """Return the encoded payload for a request."""
+        if type(request) is ExoyOneCommand:
+            return request.payload
+        if self._codec.native:
+            # Caching costs more than a native encoder takes to encode.
+            return self._codec.encode(request)
+        if len(request) != 1:
+            return self._encode(request)
+        return self.command(request).payload
+
+    def _encode(self, request: ExoyOneRequest) -> bytes:
+        """Encode a request from a template if every value is an integer."""
+        values = tuple(request.values())
+        if not all(type(value) is int for value in values):
+            return self._codec.encode(request)
+
+        keys = tuple(request)
+        template = self._templates.get(keys)
+        if template is None:
+            if keys in self._templates:
+                return self._codec.encode(request)
+            template = self._templates[keys] = self._template(keys)
+            if template is None:
+                return self._codec.encode(request)
+        return template % values
+
+    def _template(self, keys: tuple[str, ...]) -> bytes | None:
+        """Return a format string for the keys, or None if it is ambiguous."""
+        encoded = self._codec.encode(dict.fromkeys(keys, _PLACEHOLDER))
+        fragments = encoded.replace(b"%", b"%%").split(_PLACEHOLDER_BYTES)
+        if len(fragments) != len(keys) + 1:
+            _LOGGER.debug("Unable to build a command template for %s", keys)
+            return None
+        return b"%d".join(fragments)
+
+
+_commands: dict[str, ExoyOneCommands] = {}
+
+
+def get_commands(codec: ExoyOneCodec) -> ExoyOneCommands:
+    """Return the shared command cache for a codec."""
+    if codec.name not in _commands:
+        _commands[codec.name] = ExoyOneCommands(codec)
+    return _commands[codec.name]
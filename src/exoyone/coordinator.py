@@ -0,0 +1,130 @@
+"""Shared polling of an ExoyOne with change notifications."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Self
+
+from .models import ExoyOneException, ExoyOneTimeoutError
+from .state import StateChanges
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .exoyone import ExoyOne
+    from .state import ExoyOneState
+
+_LOGGER = logging.getLogger(__package__)
+
+ChangeListener = Callable[[StateChanges], None] | asyncio.Queue[StateChanges]
+
+
+class ExoyOneCoordinator:
+    """Poll an ExoyOne once on a schedule and share the changes with listeners."""
+
+    def __init__(self, exoyone: ExoyOne, interval: float = 5.0) -> None:
+        """Initialize the coordinator without starting to poll."""
+        self._exoyone = exoyone
+        self._interval = interval
+        self._listeners: list[ChangeListener] = []
+        self._previous: ExoyOneState | None = None
+        self._poller: asyncio.Task[None] | None = None
+        self.last_update_success = False
+
+    async def __aenter__(self) -> Self:
+        """Start polling when used as an async context manager."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop polling on exit."""
+        await self.async_stop()
+
+    @property
+    def exoyone(self) -> ExoyOne:
+        """Return the coordinated ExoyOne."""
+        return self._exoyone
+
+    @property
+    def interval(self) -> float:
+        """Return the polling interval in seconds."""
+        return self._interval
+
+    def add_listener(self, listener: ChangeListener) -> Callable[[], None]:
+        """
+        Register a callback or queue to receive changed fields.
+
+        Listeners receive a mapping of field name to (old, new) values. The
+        first poll reports every field with an old value of None. Returns a
+        function that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    async def async_start(self) -> None:
+        """Start polling in the background."""
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._async_poll_forever())
+
+    async def async_stop(self) -> None:
+        """Stop polling."""
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    async def async_refresh(self) -> StateChanges:
+        """
+        Poll the device now and notify listeners of any changes.
+
+        A poll that fails, whether the device did not reply or sent a reply
+        that could not be read, is logged and reported through
+        last_update_success, so polling carries on.
+        """
+        try:
+            state = await self._exoyone.async_get_state()
+        except ExoyOneTimeoutError:
+            if self.last_update_success:
+                _LOGGER.warning("%s stopped responding", self._exoyone.host)
+            self.last_update_success = False
+            return {}
+        except (ExoyOneException, ValueError) as exc:
+            _LOGGER.warning("Error polling %s: %s", self._exoyone.host, exc)
+            self.last_update_success = False
+            return {}
+
+        self.last_update_success = True
+        changes = state.diff(self._previous)
+        self._previous = state
+        if changes:
+            self._notify(changes)
+        return changes
+
+    def _notify(self, changes: StateChanges) -> None:
+        """Deliver changes to every listener."""
+        for listener in list(self._listeners):
+            if isinstance(listener, asyncio.Queue):
+                listener.put_nowait(changes)
+                continue
+            try:
+                listener(changes)
+            except Exception:
+                _LOGGER.exception("Error in listener for %s", self._exoyone.host)
+
+    async def _async_poll_forever(self) -> None:
+        """Poll the device every interval until stopped."""
+        while True:
+            await self.async_refresh()
+            await asyncio.sleep(self._interval)
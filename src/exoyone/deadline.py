@@ -0,0 +1,126 @@
+"""Deadlines and retry budgets shared by nested ExoyOne operations."""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Self
+
+from .models import ExoyOneTimeoutError
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .exoyone import ExoyOne
+
+_LOGGER = logging.getLogger(__package__)
+
+_active_deadline: ContextVar[ExoyOneDeadline | None] = ContextVar(
+    "exoyone_deadline", default=None
+)
+
+
+def active_deadline(device: ExoyOne) -> ExoyOneDeadline | None:
+    """Return the deadline open for a device in the current context, if any."""
+    deadline = _active_deadline.get()
+    while deadline is not None and deadline.device is not device:
+        deadline = deadline._outer
+    return deadline
+
+
+def detach_deadlines() -> None:
+    """Stop the current context being bound by any open deadline."""
+    _active_deadline.set(None)
+
+
+class ExoyOneDeadline:
+    """
+    An overall deadline and retry budget for an ExoyOne operation.
+
+    A setter sends the setting and then reads the state back, and both resend
+    lost datagrams. Every send and read made on behalf of an operation draws
+    on the same deadline and the same number of retries, so the worst case is
+    bounded however the operations nest. A deadline opened within another can
+    only tighten it, and its retries are also taken from the outer budget.
+    Entering the deadline opens it for its device until it is exited.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        timeout: float,
+        retries: int,
+        parent: ExoyOneDeadline | None = None,
+        device: ExoyOne | None = None,
+    ) -> None:
+        """Initialize the deadline, which starts now."""
+        self._host = host
+        self._timeout = timeout
+        self._expires_at = time.monotonic() + timeout
+        self._retries = retries
+        self._parent = parent
+        self._device = device
+        self._outer: ExoyOneDeadline | None = None
+        self._token: Any = None
+        self.retried = 0
+
+    def __enter__(self) -> Self:
+        """Open the deadline for its device in the current context."""
+        self._outer = _active_deadline.get()
+        self._token = _active_deadline.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the deadline."""
+        if self._token is not None:
+            _active_deadline.reset(self._token)
+            self._token = None
+
+    @property
+    def device(self) -> ExoyOne | None:
+        """Return the ExoyOne the deadline bounds, if it is open for one."""
+        return self._device
+
+    @property
+    def expires_at(self) -> float:
+        """Return the monotonic time the deadline expires."""
+        if self._parent is None:
+            return self._expires_at
+        return min(self._expires_at, self._parent.expires_at)
+
+    def remaining(self) -> float:
+        """Return the number of seconds left before the deadline."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def limit(self, timeout: float) -> float:
+        """Return a timeout cut short at the deadline, raising if it has passed."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.expired()
+        return min(timeout, remaining)
+
+    def retry(self) -> None:
+        """Take a retry from the budget, raising if none are left."""
+        if self.remaining() <= 0:
+            raise self.expired()
+        if self.retried >= self._retries:
+            raise ExoyOneTimeoutError(
+                f"{self._host} did not respond after {self.retried} retries"
+            )
+        if self._parent is not None:
+            self._parent.retry()
+        self.retried += 1
+
+    def expired(self) -> ExoyOneTimeoutError:
+        """Return the error raised once the deadline has passed."""
+        if self._parent is not None and self._parent.expires_at < self._expires_at:
+            return self._parent.expired()
+        return ExoyOneTimeoutError(
+            f"{self._host} did not respond within the {self._timeout:g}s deadline"
+        )
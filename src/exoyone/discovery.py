@@ -0,0 +1,215 @@
+"""Zeroconf-based discovery of ExoyOne devices."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar, Self
+
+from zeroconf import IPVersion, ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf
+
+from .exoyone import ExoyOne
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass
+class ExoyOneDiscoveryRecord:
+    """A discovered ExoyOne device."""
+
+    mdns_name: str
+    host: str
+    last_seen: float
+
+
+class ExoyOneDiscovery:
+    """Continuously updated index of ExoyOne devices found via Zeroconf."""
+
+    SERVICE_TYPES: ClassVar[list[str]] = ["_http._tcp.local."]
+    NAME_PREFIX: ClassVar[str] = "exoyone"
+    RESOLVE_TIMEOUT: ClassVar[int] = 3000
+
+    def __init__(
+        self,
+        cache_path: Path | None = None,
+        port: int = 8888,
+        aiozc: AsyncZeroconf | None = None,
+    ) -> None:
+        """
+        Initialize discovery.
+
+        If a cache path is provided, previously discovered devices are loaded
+        from it on start and the index is written back to it on stop, so each
+        run only needs to pick up changes.
+        """
+        self._cache_path = cache_path
+        self._port = port
+        self._aiozc = aiozc
+        self._owns_aiozc = aiozc is None
+        self._browser: AsyncServiceBrowser | None = None
+        self._records: dict[str, ExoyOneDiscoveryRecord] = {}
+        self._service_names: dict[str, str] = {}
+        self._exoyones: dict[str, ExoyOne] = {}
+        self._resolving: set[asyncio.Task[None]] = set()
+        self._changed: asyncio.Event | None = None
+
+    async def __aenter__(self) -> Self:
+        """Start browsing when used as an async context manager."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop browsing on exit."""
+        await self.async_stop()
+
+    @property
+    def devices(self) -> dict[str, ExoyOneDiscoveryRecord]:
+        """Return the discovered devices keyed by mDNS name."""
+        return dict(self._records)
+
+    async def async_start(self) -> None:
+        """Load the cached index and start browsing for devices."""
+        self.load()
+        self._changed = asyncio.Event()
+        if self._aiozc is None:
+            self._aiozc = AsyncZeroconf(ip_version=IPVersion.V4Only)
+        self._browser = AsyncServiceBrowser(
+            self._aiozc.zeroconf,
+            self.SERVICE_TYPES,
+            handlers=[self._on_service_state_change],
+        )
+
+    async def async_stop(self) -> None:
+        """Stop browsing, save the index and close any handed-out ExoyOnes."""
+        if self._browser is not None:
+            await self._browser.async_cancel()
+            self._browser = None
+        for task in self._resolving:
+            task.cancel()
+        self._resolving.clear()
+        if self._aiozc is not None and self._owns_aiozc:
+            await self._aiozc.async_close()
+            self._aiozc = None
+        for exoyone in self._exoyones.values():
+            exoyone.close()
+        self.save()
+
+    async def async_wait_for(
+        self, mdns_name: str, timeout: float
+    ) -> ExoyOneDiscoveryRecord:
+        """Wait until a device has been discovered and return its record."""
+        async with asyncio.timeout(timeout):
+            while mdns_name not in self._records:
+                if self._changed is None:
+                    raise RuntimeError("Discovery has not been started")
+                self._changed.clear()
+                await self._changed.wait()
+        return self._records[mdns_name]
+
+    def get_exoyone(self, mdns_name: str) -> ExoyOne:
+        """Return an ExoyOne for a discovered device at its current address."""
+        record = self._records[mdns_name]
+        exoyone = self._exoyones.get(mdns_name)
+        if exoyone is None or exoyone.host != record.host:
+            if exoyone is not None:
+                exoyone.close()
+            exoyone = ExoyOne(record.host, self._port)
+            self._exoyones[mdns_name] = exoyone
+        return exoyone
+
+    def update(self, mdns_name: str, host: str) -> None:
+        """Record that a device has been seen at an address."""
+        record = self._records.get(mdns_name)
+        if record is None:
+            _LOGGER.debug("Discovered %s at %s", mdns_name, host)
+            self._records[mdns_name] = ExoyOneDiscoveryRecord(
+                mdns_name, host, time.time()
+            )
+        else:
+            if record.host != host:
+                _LOGGER.debug("%s moved from %s to %s", mdns_name, record.host, host)
+            record.host = host
+            record.last_seen = time.time()
+        if self._changed is not None:
+            self._changed.set()
+
+    def remove(self, mdns_name: str) -> None:
+        """Remove a device from the index."""
+        self._records.pop(mdns_name, None)
+        exoyone = self._exoyones.pop(mdns_name, None)
+        if exoyone is not None:
+            exoyone.close()
+
+    def load(self) -> None:
+        """Load previously discovered devices from the cache file."""
+        if self._cache_path is None or not self._cache_path.exists():
+            return
+        try:
+            cached = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            for entry in cached:
+                record = ExoyOneDiscoveryRecord(**entry)
+                self._records.setdefault(record.mdns_name, record)
+        except (OSError, TypeError, ValueError) as exc:
+            _LOGGER.warning("Ignoring unreadable discovery cache: %s", exc)
+
+    def save(self) -> None:
+        """Write the discovered devices to the cache file."""
+        if self._cache_path is None:
+            return
+        self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache_path.write_text(
+            json.dumps([asdict(record) for record in self._records.values()]),
+            encoding="utf-8",
+        )
+
+    def _on_service_state_change(
+        self,
+        zeroconf: Zeroconf,
+        service_type: str,
+        name: str,
+        state_change: ServiceStateChange,
+    ) -> None:
+        """Handle a Zeroconf service being added, updated or removed."""
+        if state_change is ServiceStateChange.Removed:
+            mdns_name = self._service_names.pop(name, None)
+            if mdns_name is not None:
+                _LOGGER.debug("%s is no longer advertised", mdns_name)
+            return
+
+        task = asyncio.create_task(self._async_resolve(service_type, name))
+        self._resolving.add(task)
+        task.add_done_callback(self._resolving.discard)
+
+    async def _async_resolve(self, service_type: str, name: str) -> None:
+        """Resolve a service and update the index if it is an ExoyOne."""
+        if self._aiozc is None:
+            return
+        info = await self._aiozc.async_get_service_info(
+            service_type, name, self.RESOLVE_TIMEOUT
+        )
+        if info is None or info.server is None:
+            return
+
+        mdns_name = info.server.removesuffix(".").removesuffix(".local")
+        if not mdns_name.lower().startswith(self.NAME_PREFIX):
+            return
+
+        addresses = info.parsed_addresses(IPVersion.V4Only)
+        if not addresses:
+            return
+
+        self._service_names[name] = mdns_name
+        self.update(mdns_name, addresses[0])
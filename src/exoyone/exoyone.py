@@ -3,29 +3,48 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from collections.abc import Mapping
-from typing import TYPE_CHECKING, ClassVar
-
-import asyncio_dgram
-import backoff
+import math
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, ClassVar, Self, TypeVar
 
 from . import __version__
+from .batch import ExoyOneBatch, active_batch
+from .breaker import Availability, CircuitBreaker
+from .codec import get_codec
+from .commands import get_commands
+from .deadline import ExoyOneDeadline, active_deadline, detach_deadlines
 from .models import (
     ExoyDevices,
+    ExoyOneException,
+    ExoyOnePriority,
+    ExoyOneRequest,
     ExoyOneTimeoutError,
+    ExoyOneUnavailableError,
     ExoyOneValueError,
     ModePacks,
     TruthyFalsyWords,
 )
+from .ratelimit import ThrottleStats, TokenBucket
+from .rtt import HedgeStats, RttEstimator
+from .scenes import ExoyOneScene
+from .sendqueue import QueueStats, SendQueue
 from .state import ExoyOneState
+from .transitions import HSB_KEYS, ExoyOneTransition, TransitionStats
+from .transport import ExoyOneReply, ExoyOneTransport
+from .writes import ExoyOneWrite
 
 if TYPE_CHECKING:
-    from asyncio_dgram import DatagramClient
+    from collections.abc import Coroutine
+    from types import TracebackType
 
 _LOGGER = logging.getLogger(__package__)
 
+_T = TypeVar("_T")
+
 pyexoyone_version = __version__
 
 
@@ -33,13 +52,111 @@ class ExoyOne:
     """Representation of an ExoyOne Light."""
 
     TIMEOUT: ClassVar[float] = 3.0
+    MIN_TIMEOUT: ClassVar[float] = 0.02
+    INITIAL_TIMEOUT: ClassVar[float] = 1.0
+    MAX_TRIES: ClassVar[int] = 3
+    MAX_RESENDS: ClassVar[int] = 2
+    DEADLINE: ClassVar[float] = 10.0
+    FAILURE_THRESHOLD: ClassVar[int] = 3
+    PROBE_INTERVAL: ClassVar[float] = 5.0
+    HEDGE_PERCENTILE: ClassVar[float] = 0.9
+    HEDGE_MIN_SAMPLES: ClassVar[int] = 10
+    REPLY_LIFETIME_TIMEOUTS: ClassVar[int] = 4
+    SETTLE_TIME: ClassVar[float] = 0.1
+    CONTROL_REQUESTS: ClassVar[frozenset[str]] = frozenset(
+        {"togglePower", "restartInApMode", "connectToWifi"}
+    )
 
-    def __init__(self, host: str, port: int = 8888) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int = 8888,
+        optimistic: bool = False,
+        verify_in_background: bool = True,
+        coalesce_window: float = 0.0,
+        transport: ExoyOneTransport | None = None,
+        hedge: bool = False,
+        max_age: float = 0.0,
+        codec: str | None = None,
+        rate_limit: float = 0.0,
+        burst: int = 1,
+        deadline: float | None = None,
+        circuit_breaker: bool = True,
+    ) -> None:
         """Initialize the ExoyOne library."""
         self._host = host
         self._port = port
         self._state: ExoyOneState
+        self._reply: tuple[bytes, ExoyOneState] | None = None
         self._mp = ModePacks()
+        self._transport = transport or ExoyOneTransport(host, port)
+        self._rtt = RttEstimator(
+            initial=self.INITIAL_TIMEOUT, minimum=self.MIN_TIMEOUT, maximum=self.TIMEOUT
+        )
+        self._hedge = hedge
+        self._codec = get_codec(codec)
+        self._commands = get_commands(self._codec)
+        self._hedge_stats = HedgeStats()
+        self._limiter = TokenBucket(rate_limit, burst) if rate_limit > 0 else None
+        self._send_queue = SendQueue(self._limiter)
+        self._max_age = max_age
+        self._state_read_at = -math.inf
+        self._state_written_at = -math.inf
+        self._optimistic = optimistic
+        self._verify_in_background = verify_in_background
+        self._pending_writes: list[ExoyOneWrite] = []
+        self._read_flight: tuple[asyncio.Task[None], float] | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._breaker = CircuitBreaker(
+            self.FAILURE_THRESHOLD if circuit_breaker else None
+        )
+        self._probe: asyncio.Task[None] | None = None
+        self._coalesce_window = coalesce_window
+        self._coalesced: dict[str, Mapping[str, int | str] | bool | int | str] = {}
+        self._coalesce_flush: asyncio.Task[ExoyOneWrite] | None = None
+        self._coalesce_optimistic = False
+        self._transition_generation = 0
+        self._default_deadline = self.DEADLINE if deadline is None else deadline
+
+    async def __aenter__(self) -> Self:
+        """Open the datagram endpoint when used as an async context manager."""
+        await self.async_connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the datagram endpoint on exit."""
+        self.close()
+
+    async def async_connect(self) -> None:
+        """Open the datagram endpoint used for every request."""
+        await self._transport.async_open()
+
+    def close(self) -> None:
+        """
+        Close the datagram endpoint and stop any background verification.
+
+        Callers still waiting on the shared read or a coalesced write fail with
+        ExoyOneException rather than being cancelled.
+        """
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks.clear()
+        self._probe = None
+        if self._coalesce_flush is not None:
+            self._coalesce_flush.cancel()
+            self._coalesce_flush = None
+        self._coalesced.clear()
+        self._send_queue.close()
+        self._resolve_pending_writes(None, math.inf)
+        if self._read_flight is not None:
+            self._read_flight[0].cancel()
+            self._read_flight = None
+        self._transport.close()
 
     @property
     def host(self) -> str:
@@ -59,6 +176,43 @@ class ExoyOne:
         """Returns the in-memory state of the ExoyOne."""
         return self._state
 
+    @property
+    def rtt(self) -> RttEstimator:
+        """Return the round-trip time estimator for this device."""
+        return self._rtt
+
+    @property
+    def hedge_stats(self) -> HedgeStats:
+        """Return how often hedged getData requests fired and won."""
+        return self._hedge_stats
+
+    @property
+    def throttle_stats(self) -> ThrottleStats:
+        """Return how often and for how long sends waited for the rate limit."""
+        if self._limiter is None:
+            return ThrottleStats()
+        return self._limiter.stats
+
+    @property
+    def availability(self) -> Availability:
+        """Return whether the device is reachable and its average latency."""
+        return self._breaker.stats
+
+    @property
+    def available(self) -> bool:
+        """Return False while the device is known to be offline."""
+        return not self._breaker.is_open
+
+    @property
+    def queue_stats(self) -> QueueStats:
+        """Return the depth of the send queue and how long sends waited in it."""
+        return self._send_queue.stats
+
+    @property
+    def timeout(self) -> float:
+        """Return the current receive timeout, derived from the observed RTT."""
+        return min(self._rtt.timeout, self.TIMEOUT)
+
     @property
     def device_type(self) -> str:
         """Return the device type."""
@@ -76,49 +230,577 @@ class ExoyOne:
 
         raise ExoyOneValueError(f"Invalid value: {value}")
 
-    @backoff.on_exception(
-        backoff.expo,
-        ExoyOneTimeoutError,
-        max_tries=3,
-        logger=_LOGGER,
-        backoff_log_level=logging.DEBUG,
-    )
     async def async_set_data(
-        self, request: Mapping[str, Mapping[str, int | str] | bool | int | str]
+        self, request: ExoyOneRequest, optimistic: bool | None = None
+    ) -> asyncio.Future[bool]:
+        """
+        Update a setting on the ExoyOne.
+
+        By default the latest state is read back from the device before
+        returning. In optimistic mode the change is applied to the in-memory
+        state immediately and verified against the next read instead.
+
+        When a coalescing window is configured, requests made within the
+        window are merged into a single request, with the latest value for
+        each key replacing any earlier one. Requests made while the rate limit
+        is holding back sends are merged the same way until it allows one.
+
+        Every setting is checked against the state read back afterwards, and
+        any that did not take are resent on their own, up to MAX_RESENDS times.
+        The returned future resolves to True once a read confirms that the
+        device applied the request, or False if it did not.
+        """
+        if (batch := active_batch(self)) is not None:
+            return batch.add(request)
+        return (await self.async_write(request, optimistic)).confirmation
+
+    async def async_write(
+        self, request: ExoyOneRequest, optimistic: bool | None = None
+    ) -> ExoyOneWrite:
+        """
+        Update settings on the ExoyOne and return the write.
+
+        This is async_set_data() outside of any batch, returning the write so
+        the result for each setting can be read from its results once its
+        confirmation resolves. A coalesced write covers every request merged
+        into it.
+        """
+        if active_deadline(self) is None:
+            with self.deadline():
+                return await self.async_write(request, optimistic)
+
+        if optimistic is None:
+            optimistic = self._optimistic
+
+        if (
+            self._coalesce_window > 0
+            or self._coalesce_flush is not None
+            or (self._limiter is not None and self._limiter.delay() > 0)
+        ):
+            return await self._async_coalesce(request, optimistic)
+        return await self._async_write(request, optimistic)
+
+    def batch(self, optimistic: bool | None = None) -> ExoyOneBatch:
+        """
+        Return a context manager that sends every setting made in it at once.
+
+            async with exoyone.batch() as batch:
+                await batch.set_effect("Hypnosis")
+                await batch.set_color((120, 255, 200))
+                await batch.toggle_music_sync(True)
+
+        The settings are merged into a single request, sent on exit and
+        verified by a single read. The batch confirmation resolves once that
+        read confirms the device applied them.
+        """
+        return ExoyOneBatch(self, optimistic)
+
+    @contextmanager
+    def deadline(
+        self, timeout: float | None = None, retries: int | None = None
+    ) -> Iterator[ExoyOneDeadline]:
+        """
+        Bound every operation in the block by one deadline and retry budget.
+
+            with exoyone.deadline(2.0):
+                await exoyone.set_effect("Hypnosis")
+                await exoyone.set_color((120, 255, 200))
+
+        Every send and read made within the block, by the task that opened it
+        or tasks it starts, shares timeout seconds (defaulting to the
+        instance's deadline) and retries resends (defaulting to MAX_TRIES - 1),
+        and raises ExoyOneTimeoutError once either runs out. Operations called
+        outside a block get a deadline of their own.
+        """
+        with ExoyOneDeadline(
+            self._host,
+            self._default_deadline if timeout is None else timeout,
+            self.MAX_TRIES - 1 if retries is None else retries,
+            parent=active_deadline(self),
+            device=self,
+        ) as deadline:
+            yield deadline
+
+    def _current_deadline(self) -> ExoyOneDeadline:
+        """Return the deadline of the current operation, or a new one."""
+        if (deadline := active_deadline(self)) is not None:
+            return deadline
+        return ExoyOneDeadline(self._host, self._default_deadline, self.MAX_TRIES - 1)
+
+    async def _async_coalesce(
+        self, request: ExoyOneRequest, optimistic: bool
+    ) -> ExoyOneWrite:
+        """
+        Merge a request into the pending coalesced write.
+
+        The write is only optimistic if every request merged into it is, so a
+        caller that asked for the state to be read back always gets it.
+        """
+        self._coalesced.update(request)
+        if optimistic and hasattr(self, "_state"):
+            self._state = self._state.with_request(request)
+
+        if self._coalesce_flush is None:
+            self._coalesce_optimistic = optimistic
+            self._coalesce_flush = asyncio.create_task(self._async_flush_coalesced())
+        else:
+            self._coalesce_optimistic &= optimistic
+        return await self._async_wait_shared(self._coalesce_flush)
+
+    async def _async_flush_coalesced(self) -> ExoyOneWrite:
+        """Send the merged request once the window and the rate limit allow."""
+        await asyncio.sleep(self._coalesce_window)
+        if self._limiter is not None:
+            await self._limiter.async_wait()
+        request, self._coalesced = self._coalesced, {}
+        optimistic = self._coalesce_optimistic
+        self._coalesce_flush = None
+        _LOGGER.debug("Sending coalesced request to %s: %s", self._host, request)
+        return await self._async_write(request, optimistic)
+
+    async def _async_write(
+        self, request: ExoyOneRequest, optimistic: bool
+    ) -> ExoyOneWrite:
+        """Send a single request and track its confirmation."""
+        write = ExoyOneWrite(
+            dict(request),
+            asyncio.get_running_loop().create_future(),
+            time.monotonic(),
+        )
+        self._pending_writes.append(write)
+        if not optimistic or len(write.expected) < len(request):
+            # The cached state cannot be updated in place, so invalidate it.
+            self._state_written_at = write.written_at
+
+        try:
+            if not optimistic:
+                await self._async_set_and_refresh(request)
+                return write
+
+            await self._async_send_request(request)
+        except BaseException:
+            if write in self._pending_writes:
+                self._pending_writes.remove(write)
+            write.confirmation.cancel()
+            raise
+
+        if hasattr(self, "_state"):
+            self._state = self._state.with_request(request)
+        if self._verify_in_background:
+            self._start_background(self._async_verify_writes())
+        return write
+
+    async def async_confirm_writes(self) -> bool:
+        """Read the state now and return True if all pending writes took effect."""
+        if not self._pending_writes:
+            return True
+        if active_deadline(self) is None:
+            with self.deadline():
+                return await self.async_confirm_writes()
+        pending = [write.confirmation for write in self._pending_writes]
+        await self._async_shared_read(not_before=self._last_written_at())
+        return all(await asyncio.gather(*pending))
+
+    async def _async_verify_writes(self) -> None:
+        """Verify pending optimistic writes after giving the device time to settle."""
+        # Verification is not bound by the deadline of the write that started it.
+        detach_deadlines()
+        await asyncio.sleep(self.SETTLE_TIME)
+        if not self._pending_writes:
+            return
+        started = time.monotonic()
+        try:
+            await self._async_shared_read(not_before=self._last_written_at())
+        except ExoyOneTimeoutError:
+            _LOGGER.debug("Unable to verify writes to %s", self._host)
+            # Resends still in progress are resolved by _async_resend.
+            self._resolve_pending_writes(None, started)
+
+    def _last_written_at(self) -> float:
+        """Return when the most recently sent pending write was sent."""
+        return max(
+            (
+                write.written_at
+                for write in self._pending_writes
+                if write.written_at < math.inf
+            ),
+            default=-math.inf,
+        )
+
+    def _resolve_pending_writes(
+        self, state: ExoyOneState | None, read_started: float
     ) -> None:
-        """Update a setting on the ExoyOne, then get the latest state data."""
-        encoded_update = json.dumps(request).encode("utf-8")
+        """
+        Check writes sent before a read was started against its state.
+
+        Settings that did not take are resent, and the write stays pending
+        until the resend is verified or MAX_RESENDS is reached.
+        """
+        still_pending = []
+        for write in self._pending_writes:
+            if write.written_at > read_started:
+                still_pending.append(write)
+                continue
+            if write.confirmation.done():
+                continue
+            resend = write.check(state)
+            if state is None or (resend and write.resends >= self.MAX_RESENDS):
+                write.confirmation.set_result(False)
+            elif not resend:
+                write.confirmation.set_result(True)
+            else:
+                write.resends += 1
+                # Not checked again until the resend has been sent.
+                write.written_at = math.inf
+                still_pending.append(write)
+                self._start_background(self._async_resend(write, resend))
+        self._pending_writes = still_pending
+
+    async def _async_resend(self, write: ExoyOneWrite, request: ExoyOneRequest) -> None:
+        """Resend the settings of a write that did not take, then verify them."""
+        detach_deadlines()
+        _LOGGER.debug(
+            "Resending %s to %s (%s of %s)",
+            request,
+            self._host,
+            write.resends,
+            self.MAX_RESENDS,
+        )
+        try:
+            write.written_at = await self._async_send_request(request)
+            self._state_written_at = write.written_at
+            await asyncio.sleep(self.SETTLE_TIME)
+            await self._async_shared_read(not_before=write.written_at)
+        except ExoyOneTimeoutError:
+            _LOGGER.debug("Unable to verify resend to %s", self._host)
+            if write in self._pending_writes:
+                self._pending_writes.remove(write)
+            if not write.confirmation.done():
+                write.confirmation.set_result(False)
+
+    def _start_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine as a background task that close() cancels."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _priority(self, request: ExoyOneRequest) -> ExoyOnePriority:
+        """Return the send priority for a request."""
+        if self.CONTROL_REQUESTS.isdisjoint(request):
+            return ExoyOnePriority.NORMAL
+        return ExoyOnePriority.CONTROL
+
+    async def _async_send(
+        self,
+        payload: bytes,
+        timeout: float,
+        priority: ExoyOnePriority = ExoyOnePriority.NORMAL,
+        expects_reply: bool = False,
+    ) -> float:
+        """Send a datagram in its turn and return when it was sent."""
+        deadline = self._current_deadline()
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                await self._send_queue.async_turn(priority)
+        except TimeoutError as exc:
+            raise deadline.expired() from exc
+        return await self._transport.async_send(
+            payload, timeout=deadline.limit(timeout), expects_reply=expects_reply
+        )
+
+    async def _async_send_request(self, request: ExoyOneRequest) -> float:
+        """Send a request to the ExoyOne without waiting for the result."""
+        self._raise_if_unavailable()
+        encoded_update = self._commands.encode(request)
+        deadline = self._current_deadline()
+        while True:
+            try:
+                return await self._async_send(
+                    encoded_update,
+                    timeout=self.TIMEOUT,
+                    priority=self._priority(request),
+                )
+            except ExoyOneTimeoutError:
+                raise
+            except TimeoutError:
+                _LOGGER.debug("Timed out sending to %s", self._host)
+                deadline.retry()
+
+    async def _async_set_and_refresh(self, request: ExoyOneRequest) -> None:
+        """Send a request to the ExoyOne, then get the latest state data."""
+        sent_at = await self._async_send_request(request)
+        await asyncio.sleep(self.SETTLE_TIME)
+        await self._async_shared_read(not_before=sent_at)
+
+    async def async_send_frame(self, request: ExoyOneRequest) -> bool:
+        """
+        Send a streamed update once, without retrying, tracking or verifying it.
+
+        This is for streaming many updates in a row, such as the frames of a
+        colour transition, where a lost frame is soon replaced by the next.
+        Frames are sent at the lowest priority, and a frame still waiting for
+        its turn is dropped when a newer one is sent, in which case this
+        returns False. The request is applied to the in-memory state, as in
+        optimistic mode.
+        """
+        if not await self._send_queue.async_turn(ExoyOnePriority.STREAM, key="frame"):
+            return False
         try:
-            stream: DatagramClient = await asyncio_dgram.connect(
-                (self._host, self._port)
+            await self._transport.async_send(
+                self._commands.encode(request), timeout=self.TIMEOUT
             )
-            await asyncio.wait_for(stream.send(encoded_update), timeout=self.TIMEOUT)
-            stream.close()
-            await asyncio.sleep(0.1)
-            await self.async_get_data()
         except TimeoutError as exc:
             raise ExoyOneTimeoutError() from exc
+        if hasattr(self, "_state"):
+            self._state = self._state.with_request(request)
+        return True
 
-    @backoff.on_exception(
-        backoff.expo,
-        ExoyOneTimeoutError,
-        max_tries=3,
-        logger=_LOGGER,
-        backoff_log_level=logging.DEBUG,
-    )
     async def async_get_data(self) -> None:
-        """Update the in-memory state using data from the ExoyOne."""
+        """
+        Update the in-memory state using data from the ExoyOne.
+
+        Concurrent calls share a single in-flight request and its result. The
+        request is bound by the deadline of the call that started it, and each
+        caller stops waiting at its own deadline.
+        """
+        if active_deadline(self) is None:
+            with self.deadline():
+                await self._async_shared_read()
+            return
+        await self._async_shared_read()
+
+    async def _async_shared_read(self, not_before: float | None = None) -> None:
+        """Wait for a read, up to the deadline of the current operation."""
+        self._raise_if_unavailable()
+        deadline = self._current_deadline()
         try:
-            stream: DatagramClient = await asyncio_dgram.connect(
-                (self._host, self._port)
-            )
-            await asyncio.wait_for(stream.send(b'{"getData": 1}'), timeout=self.TIMEOUT)
-            reply, _ = await asyncio.wait_for(stream.recv(), timeout=self.TIMEOUT)
-            data = json.loads(reply.decode("utf-8"))
-            self._state = ExoyOneState(**data)
-            stream.close()
+            async with asyncio.timeout(deadline.remaining()):
+                await self._async_join_read(not_before)
+        except ExoyOneTimeoutError:
+            raise
         except TimeoutError as exc:
-            raise ExoyOneTimeoutError() from exc
+            raise deadline.expired() from exc
+
+    async def _async_join_read(self, not_before: float | None) -> None:
+        """Join the in-flight read, or start one if there is none."""
+        while True:
+            if self._read_flight is None:
+                started = time.monotonic()
+                read = asyncio.create_task(self._async_read(started))
+                read.add_done_callback(self._read_done)
+                self._read_flight = (read, started)
+                await self._async_wait_shared(read)
+                return
+
+            read, started = self._read_flight
+            if not_before is None or started >= not_before:
+                await self._async_wait_shared(read)
+                return
+
+            # The in-flight read was sent too early to observe a write, so wait
+            # for it to finish and then start (or join) a newer one.
+            await asyncio.wait([read])
+            if read.cancelled():
+                raise ExoyOneException(f"{self._host} was closed")
+
+    async def _async_wait_shared(self, task: asyncio.Task[_T]) -> _T:
+        """
+        Wait for a task shared by several callers.
+
+        The task is shielded, so a caller that stops waiting does not cancel
+        it for the others. If close() cancels the task instead, the callers
+        fail with ExoyOneException, as nobody cancelled them.
+        """
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if task.cancelled() and current is not None and not current.cancelling():
+                raise ExoyOneException(f"{self._host} was closed") from None
+            raise
+
+    def _read_done(self, read: asyncio.Task[None]) -> None:
+        """Clear the in-flight read once it completes."""
+        if self._read_flight is not None and self._read_flight[0] is read:
+            self._read_flight = None
+        if not read.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled.
+            read.exception()
+
+    async def _async_read(self, started: float) -> None:
+        """
+        Request the state from the ExoyOne and update the in-memory state.
+
+        Each attempt waits for the RTT-derived timeout before retrying, so a
+        lost datagram is resent quickly on a healthy network. Retries are taken
+        from the budget of the operation that started the read. Replies to
+        requests sent before this read started are ignored.
+        """
+        if discarded := self._transport.discard_pending(self._reply_lifetime()):
+            _LOGGER.debug("Discarded %s late replies from %s", discarded, self._host)
+
+        deadline = self._current_deadline()
+        attempt = 0
+        first_sent_at: float | None = None
+        try:
+            while True:
+                attempt += 1
+                timeout = deadline.limit(self.timeout)
+                try:
+                    sent_at = await self._async_send(
+                        b'{"getData": 1}', timeout=timeout, expects_reply=True
+                    )
+                    if first_sent_at is None:
+                        first_sent_at = sent_at
+                    reply, hedged = await self._async_recv_reply(
+                        timeout, sent_at, started
+                    )
+                    latency = reply.received_at - first_sent_at
+                    break
+                except ExoyOneTimeoutError:
+                    raise
+                except TimeoutError:
+                    _LOGGER.debug(
+                        "No reply from %s within %.3fs (attempt %s)",
+                        self._host,
+                        timeout,
+                        attempt,
+                    )
+                    self._rtt.backoff()
+                    deadline.retry()
+        except ExoyOneTimeoutError:
+            if self._breaker.record_failure():
+                _LOGGER.warning("%s is unavailable", self._host)
+                self._start_probe()
+            raise
+
+        # Every read counts towards the hedging percentile, or the slow reads
+        # that are hedged would be left out and the threshold would keep
+        # falling. Only unambiguous replies are sampled for the retransmission
+        # timeout (Karn's algorithm).
+        self._rtt.observe(latency)
+        if attempt == 1 and not hedged:
+            self._rtt.sample(reply.received_at - reply.sent_at)
+        if self._breaker.record_success(reply.received_at - reply.sent_at):
+            _LOGGER.info("%s is available again", self._host)
+        self._apply_reply(reply)
+
+    def _raise_if_unavailable(self) -> None:
+        """
+        Fail without sending anything while the circuit breaker is open.
+
+        The probe is restarted if it is not running, for example after the
+        device was closed or moved to another event loop while unavailable.
+        """
+        if self._breaker.is_open:
+            self._start_probe()
+            raise ExoyOneUnavailableError(f"{self._host} is unavailable")
+
+    def _start_probe(self) -> None:
+        """Start probing the device in the background, unless already probing."""
+        if (
+            self._probe is not None
+            and not self._probe.done()
+            and self._probe.get_loop() is asyncio.get_running_loop()
+        ):
+            return
+        self._probe = asyncio.create_task(self._async_probe())
+        self._background_tasks.add(self._probe)
+        self._probe.add_done_callback(self._background_tasks.discard)
+
+    async def _async_probe(self) -> None:
+        """Send a single getData every PROBE_INTERVAL until the device replies."""
+        detach_deadlines()
+        while self._breaker.is_open:
+            await asyncio.sleep(self.PROBE_INTERVAL)
+            try:
+                with self.deadline(self.TIMEOUT, retries=0):
+                    await self._async_join_read(None)
+            except ExoyOneTimeoutError:
+                _LOGGER.debug("Probe of %s got no reply", self._host)
+
+    def _apply_reply(self, reply: ExoyOneReply) -> None:
+        """
+        Update the in-memory state from a getData reply.
+
+        A reply never replaces state read by a newer request, and optimistic
+        writes sent after its request are applied on top of it.
+        """
+        if reply.sent_at < self._state_read_at:
+            _LOGGER.debug("Ignoring out of order reply from %s", self._host)
+            return
+
+        if self._reply is not None and self._reply[0] == reply.data:
+            # Nothing changed since the last reply, so skip decoding it.
+            state = self._reply[1]
+        else:
+            state = ExoyOneState.from_reply(self._codec.decode(reply.data))
+            self._reply = (reply.data, state)
+        self._resolve_pending_writes(state, reply.sent_at)
+
+        if hasattr(self, "_state"):
+            for write in self._pending_writes:
+                if self._state.matches(fields := write.fields):
+                    state = replace(state, **fields)
+        self._state = state
+        self._state_read_at = reply.sent_at
+
+    async def _async_recv_reply(
+        self, timeout: float, sent_at: float, started: float
+    ) -> tuple[ExoyOneReply, bool]:
+        """
+        Wait for a getData reply, hedging if it is slower than usual.
+
+        When hedging is enabled, a duplicate getData is sent if no reply has
+        arrived within the device's observed p90 latency, and whichever reply
+        arrives first is used. Returns the reply and whether a hedge was sent.
+        """
+        hedge_after = None
+        if self._hedge and self._rtt.observations >= self.HEDGE_MIN_SAMPLES:
+            hedge_after = self._rtt.percentile(self.HEDGE_PERCENTILE)
+        if hedge_after is None or hedge_after >= timeout:
+            return await self._async_recv_since(started, timeout), False
+
+        try:
+            return await self._async_recv_since(started, hedge_after), False
+        except TimeoutError:
+            pass
+
+        hedged_at = await self._async_send(
+            b'{"getData": 1}', timeout=timeout, expects_reply=True
+        )
+        self._hedge_stats.fired += 1
+        reply = await self._async_recv_since(started, timeout - hedge_after)
+
+        # The device answers in order, so a reply is always matched to the
+        # original request first. Attribute it to whichever request it is
+        # closer to the smoothed RTT for instead.
+        srtt = self._rtt.srtt or 0.0
+        if abs(reply.received_at - hedged_at - srtt) < abs(
+            reply.received_at - sent_at - srtt
+        ):
+            self._hedge_stats.won += 1
+        return reply, True
+
+    def _reply_lifetime(self) -> float:
+        """
+        Return how long a reply can still arrive after its request was sent.
+
+        Requests older than this are taken to have been lost. It is a multiple
+        of the retransmission timeout, so it grows while replies are late.
+        """
+        return self.REPLY_LIFETIME_TIMEOUTS * self._rtt.timeout
+
+    async def _async_recv_since(self, started: float, timeout: float) -> ExoyOneReply:
+        """Wait for a reply to a request sent no earlier than started."""
+        async with asyncio.timeout(timeout):
+            while True:
+                reply = await self._transport.async_recv(
+                    timeout=timeout, lifetime=self._reply_lifetime()
+                )
+                if reply.sent_at >= started:
+                    return reply
+                _LOGGER.debug("Ignoring stale reply from %s", self._host)
 
     def get_active_pack_name(self) -> str:
         """Return the name of the currently active modpack."""
@@ -131,11 +813,53 @@ class ExoyOne:
             effect_index=self._state.modeIndex,
         )
 
-    async def async_get_state(self) -> ExoyOneState:
-        """Return the current state as an ExoyOne object."""
+    @property
+    def state_age(self) -> float:
+        """Return the number of seconds since the cached state was requested."""
+        return time.monotonic() - self._state_read_at
+
+    async def async_get_state(self, max_age: float | None = None) -> ExoyOneState:
+        """
+        Return the current state as an ExoyOne object.
+
+        If the cached state was read less than max_age seconds ago (defaulting
+        to the instance's max_age) and no write has invalidated it since, it is
+        returned without a network round trip.
+        """
+        if max_age is None:
+            max_age = self._max_age
+        if (
+            max_age > 0
+            and self._state_read_at >= self._state_written_at
+            and self.state_age <= max_age
+        ):
+            return self._state
         await self.async_get_data()
         return self._state
 
+    def capture_scene(self, name: str) -> ExoyOneScene:
+        """Return the current state as a named scene."""
+        return ExoyOneScene.capture(name, self._state)
+
+    async def async_restore_scene(
+        self, scene: ExoyOneScene, optimistic: bool | None = None
+    ) -> asyncio.Future[bool]:
+        """
+        Restore a scene by sending only the settings that differ from it.
+
+        The difference is taken from the cached state, which is read first if
+        there is none. Every changed setting is sent in a single request.
+        """
+        if not hasattr(self, "_state"):
+            await self.async_get_data()
+        request = scene.request_from(self._state)
+        if not request:
+            confirmation = asyncio.get_running_loop().create_future()
+            confirmation.set_result(True)
+            return confirmation
+        _LOGGER.debug("Restoring scene %s on %s: %s", scene.name, self._host, request)
+        return await self.async_set_data(request, optimistic=optimistic)
+
     async def restart_in_ap_mode(self) -> None:
         """Restart the device in AP mode."""
         await self.async_set_data({"restartInApMode": True})
@@ -168,6 +892,50 @@ class ExoyOne:
             }
         )
 
+    async def async_transition(
+        self,
+        hue: int | None = None,
+        saturation: int | None = None,
+        brightness: int | None = None,
+        duration: float = 2.0,
+        fps: float = 20.0,
+    ) -> TransitionStats:
+        """
+        Fade from the current colour to a new one over a duration in seconds.
+
+        Frames are streamed at up to fps frames per second without waiting for
+        each one to be verified, then the final colour is written optimistically
+        and verified. Components left as None keep their current value. Starting
+        another transition on the device stops this one.
+        """
+        if fps <= 0:
+            raise ExoyOneValueError(f"Frame rate must be positive, not {fps}")
+        if not hasattr(self, "_state"):
+            await self.async_get_data()
+        start = (self._state.hue, self._state.saturation, self._state.brightness)
+
+        def _target(value: int | None, current: int) -> int:
+            return current if value is None else max(0, min(value, 255))
+
+        end = (
+            _target(hue, start[0]),
+            _target(saturation, start[1]),
+            _target(brightness, start[2]),
+        )
+
+        self._transition_generation += 1
+        generation = self._transition_generation
+        transition = ExoyOneTransition(self, start, end, duration, fps)
+        stats = await transition.async_run(
+            lambda: self._transition_generation == generation
+        )
+        if not stats.superseded:
+            await self.async_set_data(
+                dict(zip(HSB_KEYS, end, strict=True)), optimistic=True
+            )
+        _LOGGER.debug("Transition on %s finished: %s", self._host, stats)
+        return stats
+
     async def set_hue(self, hue: int) -> None:
         """Set the hue."""
         await self._async_set_hsbs(key="setHue", value=hue)
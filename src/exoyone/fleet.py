@@ -0,0 +1,243 @@
+"""Control a fleet of ExoyOne devices over a single datagram endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Self
+
+from .codec import get_codec
+from .commands import get_commands
+from .exoyone import ExoyOne
+from .models import ExoyOneRequest, ExoyOneTimeoutError
+from .transport import ExoyOneSharedTransport
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .scenes import ExoyOneScene
+    from .state import ExoyOneState
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class ExoyOneFleet:
+    """Many ExoyOne devices multiplexed over one shared datagram endpoint."""
+
+    def __init__(
+        self,
+        hosts: Iterable[str] = (),
+        port: int = 8888,
+        concurrency: int = 64,
+        **options: Any,
+    ) -> None:
+        """
+        Initialize the fleet.
+
+        Any extra keyword arguments are passed to each ExoyOne instance.
+        """
+        self._port = port
+        self._concurrency = concurrency
+        self._options = options
+        self._commands = get_commands(get_codec(options.get("codec")))
+        self._transport = ExoyOneSharedTransport()
+        self._devices: dict[str, ExoyOne] = {}
+        for host in hosts:
+            self.add(host)
+
+    async def __aenter__(self) -> Self:
+        """Bind the shared endpoint when used as an async context manager."""
+        await self._transport.async_open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close every device and the shared endpoint on exit."""
+        self.close()
+
+    def __getitem__(self, host: str) -> ExoyOne:
+        """Return the ExoyOne for a host."""
+        return self._devices[host]
+
+    def __iter__(self) -> Iterator[ExoyOne]:
+        """Iterate over the devices in the fleet."""
+        return iter(self._devices.values())
+
+    def __len__(self) -> int:
+        """Return the number of devices in the fleet."""
+        return len(self._devices)
+
+    @property
+    def hosts(self) -> list[str]:
+        """Return the hosts in the fleet."""
+        return list(self._devices)
+
+    @property
+    def offline(self) -> list[str]:
+        """Return the hosts whose circuit breaker has marked them offline."""
+        return [
+            host for host, exoyone in self._devices.items() if not exoyone.available
+        ]
+
+    def add(self, host: str) -> ExoyOne:
+        """Add a device to the fleet, or return it if it is already present."""
+        if host not in self._devices:
+            self._devices[host] = ExoyOne(
+                host,
+                self._port,
+                transport=self._transport.channel(host, self._port),
+                **self._options,
+            )
+        return self._devices[host]
+
+    def remove(self, host: str) -> None:
+        """Remove a device from the fleet."""
+        exoyone = self._devices.pop(host, None)
+        if exoyone is not None:
+            exoyone.close()
+
+    def close(self) -> None:
+        """Close every device and the shared endpoint."""
+        for exoyone in self._devices.values():
+            exoyone.close()
+        self._transport.close()
+
+    def _select(self, hosts: Iterable[str] | None, skip_offline: bool) -> list[str]:
+        """Return the hosts to run on, leaving out offline ones if asked to."""
+        selected = list(self._devices) if hosts is None else list(hosts)
+        if skip_offline:
+            selected = [host for host in selected if self._devices[host].available]
+        return selected
+
+    async def _async_run_all(
+        self,
+        hosts: Iterable[str] | None,
+        operation: Callable[[ExoyOne], Awaitable[Any]],
+        skip_offline: bool = False,
+    ) -> dict[str, Any]:
+        """Run an operation on many devices with bounded concurrency."""
+        selected = self._select(hosts, skip_offline)
+        limit = asyncio.Semaphore(self._concurrency)
+
+        async def _run(host: str) -> Any:
+            async with limit:
+                return await operation(self._devices[host])
+
+        results = await asyncio.gather(
+            *(_run(host) for host in selected), return_exceptions=True
+        )
+        for host, result in zip(selected, results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Fleet operation on %s failed: %s", host, result)
+            elif isinstance(result, BaseException):
+                raise result
+        return dict(zip(selected, results, strict=True))
+
+    async def poll_all(
+        self, hosts: Iterable[str] | None = None, skip_offline: bool = False
+    ) -> dict[str, ExoyOneState | Exception]:
+        """
+        Get the state of every device (or the given hosts) concurrently.
+
+        Devices that fail to reply have their exception returned instead.
+        Devices known to be offline fail immediately, or are left out of the
+        results entirely with skip_offline.
+        """
+        return await self._async_run_all(hosts, ExoyOne.async_get_state, skip_offline)
+
+    async def poll_as_completed(
+        self,
+        hosts: Iterable[str] | None = None,
+        deadline: float | None = None,
+        quorum: int | None = None,
+        skip_offline: bool = False,
+    ) -> AsyncIterator[tuple[str, ExoyOneState | Exception]]:
+        """
+        Yield (host, state or exception) for each device as its reply arrives.
+
+        If a deadline (in seconds) passes, or a quorum of devices have
+        replied, the remaining devices are reported as missing with an
+        ExoyOneTimeoutError instead of waiting for them to time out. Devices
+        known to be offline are left out with skip_offline.
+        """
+        selected = self._select(hosts, skip_offline)
+        limit = asyncio.Semaphore(self._concurrency)
+        expires = None if deadline is None else time.monotonic() + deadline
+
+        async def _poll(host: str) -> ExoyOneState:
+            async with limit:
+                return await self._devices[host].async_get_state()
+
+        pending = {asyncio.create_task(_poll(host)): host for host in selected}
+        replies = 0
+        try:
+            while pending and (quorum is None or replies < quorum):
+                timeout = None if expires is None else expires - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    host = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        replies += 1
+                        yield host, task.result()
+                    elif isinstance(error, Exception):
+                        yield host, error
+                    else:
+                        raise error
+
+            for host in pending.values():
+                yield host, ExoyOneTimeoutError(f"No reply from {host}")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def apply_all(
+        self,
+        request: ExoyOneRequest,
+        hosts: Iterable[str] | None = None,
+        optimistic: bool | None = None,
+        skip_offline: bool = False,
+    ) -> dict[str, asyncio.Future[bool] | Exception]:
+        """
+        Send the same request to every device (or the given hosts) concurrently.
+
+        Each device returns its write confirmation, or the exception raised.
+        The request is encoded once and the same payload sent to every device.
+        Devices known to be offline are left out with skip_offline.
+        """
+        command = self._commands.command(request)
+
+        async def _apply(exoyone: ExoyOne) -> asyncio.Future[bool]:
+            return await exoyone.async_set_data(command, optimistic=optimistic)
+
+        return await self._async_run_all(hosts, _apply, skip_offline)
+
+    async def restore_all(
+        self,
+        scene: ExoyOneScene,
+        hosts: Iterable[str] | None = None,
+        optimistic: bool | None = None,
+        skip_offline: bool = False,
+    ) -> dict[str, asyncio.Future[bool] | Exception]:
+        """
+        Restore a scene on every device (or the given hosts) concurrently.
+
+        Each device is sent only the settings that differ from the scene, and
+        returns its write confirmation, or the exception raised. Devices known
+        to be offline are left out with skip_offline.
+        """
+
+        async def _restore(exoyone: ExoyOne) -> asyncio.Future[bool]:
+            return await exoyone.async_restore_scene(scene, optimistic=optimistic)
+
+        return await self._async_run_all(hosts, _restore, skip_offline)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from enum import IntEnum
 from typing import TYPE_CHECKING, ClassVar
 
@@ -11,6 +12,8 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__package__)
 
+ExoyOneRequest = Mapping[str, Mapping[str, int | str] | bool | int | str]
+
 
 class ExoyOneException(Exception):
     """ExoyOne exception."""
@@ -20,6 +23,10 @@ class ExoyOneTimeoutError(TimeoutError):
     """ExoyOne timeout error."""
 
 
+class ExoyOneUnavailableError(ExoyOneTimeoutError):
+    """ExoyOne unavailable error."""
+
+
 class ExoyOneValueError(ValueError):
     """ExoyOne value error."""
 
@@ -52,6 +59,14 @@ class ExoyDevices(IntEnum):
     ULTRA_DENSE_SOUND_VISUALISER = 14
 
 
+class ExoyOnePriority(IntEnum):
+    """Priority classes for datagrams waiting to be sent, highest first."""
+
+    CONTROL = 0
+    NORMAL = 1
+    STREAM = 2
+
+
 class TruthyFalsyWords(IntEnum):
     """Truthy and falsy words."""
 
@@ -0,0 +1,80 @@
+"""Rate limiting of datagrams sent to an ExoyOne."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from .models import ExoyOneValueError
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass
+class ThrottleStats:
+    """Counters for datagrams delayed by the rate limiter."""
+
+    throttled: int = 0
+    throttled_time: float = 0.0
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of datagrams sent to a device.
+
+    Tokens are added at rate per second, up to burst tokens, and each
+    datagram takes one. Up to burst datagrams can be sent back to back
+    before the rate applies.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Initialize a full bucket."""
+        if rate <= 0:
+            raise ExoyOneValueError(f"Rate limit must be positive, not {rate}")
+        if burst < 1:
+            raise ExoyOneValueError(f"Burst must be at least 1, not {burst}")
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self.stats = ThrottleStats()
+
+    @property
+    def rate(self) -> float:
+        """Return the number of tokens added per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """Return the maximum number of tokens."""
+        return self._burst
+
+    def delay(self) -> float:
+        """Return the number of seconds until a token is available."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+
+    async def async_wait(self) -> None:
+        """Wait until a token is available, without taking it."""
+        delay = self.delay()
+        if delay <= 0:
+            return
+        started = time.monotonic()
+        self.stats.throttled += 1
+        try:
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.delay()
+        finally:
+            self.stats.throttled_time += time.monotonic() - started
+
+    async def async_acquire(self) -> None:
+        """Wait for a token and take it."""
+        await self.async_wait()
+        self._tokens -= 1
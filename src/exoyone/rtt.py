@@ -0,0 +1,102 @@
+"""Round-trip time estimation for ExoyOne requests."""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import ClassVar
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass
+class HedgeStats:
+    """Counters for hedged requests."""
+
+    fired: int = 0
+    won: int = 0
+
+
+class RttEstimator:
+    """
+    Smoothed round-trip time and variance tracking, as used by TCP.
+
+    The retransmission timeout follows RFC 6298: it is the smoothed RTT plus
+    four times the RTT variance, doubled after each timeout and reset by the
+    next valid sample.
+
+    Percentiles are taken over the latency of recent reads, which are
+    observed separately. A read that was retried or hedged is not a valid
+    sample for the timeout, but its latency still counts towards them.
+    """
+
+    ALPHA: ClassVar[float] = 1 / 8
+    BETA: ClassVar[float] = 1 / 4
+    K: ClassVar[int] = 4
+    WINDOW: ClassVar[int] = 64
+
+    def __init__(self, initial: float, minimum: float, maximum: float) -> None:
+        """Initialize the estimator with no samples."""
+        self._minimum = minimum
+        self._maximum = maximum
+        self._srtt: float | None = None
+        self._rttvar: float = 0.0
+        self._rto = initial
+        self._samples = 0
+        self._recent: deque[float] = deque(maxlen=self.WINDOW)
+
+    @property
+    def srtt(self) -> float | None:
+        """Return the smoothed round-trip time, if any samples were taken."""
+        return self._srtt
+
+    @property
+    def rttvar(self) -> float:
+        """Return the round-trip time variance."""
+        return self._rttvar
+
+    @property
+    def samples(self) -> int:
+        """Return the number of samples taken."""
+        return self._samples
+
+    @property
+    def observations(self) -> int:
+        """Return the number of recent latencies percentiles are taken over."""
+        return len(self._recent)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a percentile of the recent latencies, or None if there are none."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    @property
+    def timeout(self) -> float:
+        """Return the current retransmission timeout."""
+        return max(self._minimum, min(self._rto, self._maximum))
+
+    def sample(self, rtt: float) -> None:
+        """Update the estimate with a round-trip time measurement."""
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar = (1 - self.BETA) * self._rttvar + self.BETA * abs(
+                self._srtt - rtt
+            )
+            self._srtt = (1 - self.ALPHA) * self._srtt + self.ALPHA * rtt
+        self._rto = self._srtt + self.K * self._rttvar
+        self._samples += 1
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a read, measured from its first request."""
+        self._recent.append(latency)
+
+    def backoff(self) -> None:
+        """Double the retransmission timeout after a timeout."""
+        self._rto = min(self._rto * 2, self._maximum)
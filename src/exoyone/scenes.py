@@ -0,0 +1,78 @@
+"""Named ExoyOne scenes that restore with as few settings as possible."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import ClassVar
+
+from .state import REQUEST_FIELDS, ExoyOneState
+
+_LOGGER = logging.getLogger(__package__)
+
+_FIELD_REQUESTS = {field: key for key, field in REQUEST_FIELDS.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class ExoyOneScene:
+    """
+    A named snapshot of how an ExoyOne looks.
+
+    Only the fields that affect the light output are captured, so a scene
+    can be restored on any device without changing its name, shutdown timer
+    or power source.
+    """
+
+    FIELDS: ClassVar[tuple[str, ...]] = (
+        "fadingOff",
+        "brightness",
+        "currentModpack",
+        "modeIndex",
+        "speed",
+        "hue",
+        "saturation",
+        "autoChange",
+        "cycleSpeed",
+        "musicSync",
+        "sceneGeneration",
+        "direction",
+        "selectedPattern",
+        "selectedRenderMode",
+        "selectedColorMode",
+        "selectedPalette",
+    )
+
+    name: str
+    settings: Mapping[str, bool | int]
+
+    @classmethod
+    def capture(cls, name: str, state: ExoyOneState) -> ExoyOneScene:
+        """Return a scene with the given name from a state."""
+        return cls(name, {field: getattr(state, field) for field in cls.FIELDS})
+
+    def request_from(
+        self, state: ExoyOneState | None
+    ) -> dict[str, Mapping[str, int | str] | bool | int | str]:
+        """
+        Return the smallest request that changes a state into this scene.
+
+        Only settings that differ are included. The mode pack and effect are
+        always sent together, as the effect index depends on the pack. With
+        no state, every setting is included.
+        """
+        changed = {
+            field: value
+            for field, value in self.settings.items()
+            if state is None or getattr(state, field) != value
+        }
+        if changed.keys() & {"currentModpack", "modeIndex"}:
+            changed["currentModpack"] = self.settings["currentModpack"]
+            changed["modeIndex"] = self.settings["modeIndex"]
+
+        # The mode pack is set before the effect, as in ExoyOne.set_effect().
+        return {
+            _FIELD_REQUESTS[field]: int(changed[field])
+            for field in self.FIELDS
+            if field in changed
+        }
@@ -0,0 +1,179 @@
+"""Adaptive, staggered polling of a fleet of ExoyOne devices."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Self
+
+from .coordinator import ExoyOneCoordinator
+from .models import ExoyOneException
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .fleet import ExoyOneFleet
+    from .state import StateChanges
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class ExoyOneScheduler:
+    """
+    Poll every device in a fleet on its own adaptive schedule.
+
+    Polls start evenly spread across the interval and each is jittered, so
+    requests are not sent in bursts. A device that just changed is polled
+    again after min_interval; every poll that finds no change stretches its
+    interval by the backoff factor, up to max_interval, which is the longest
+    any device goes without being polled.
+    """
+
+    def __init__(
+        self,
+        fleet: ExoyOneFleet,
+        interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        jitter: float = 0.1,
+        backoff: float = 1.5,
+        concurrency: int = 64,
+    ) -> None:
+        """Initialize the scheduler without starting to poll."""
+        self._fleet = fleet
+        self._interval = interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._jitter = jitter
+        self._backoff = backoff
+        self._concurrency = concurrency
+        self._coordinators: dict[str, ExoyOneCoordinator] = {}
+        self._intervals: dict[str, float] = {}
+        self._due: dict[str, float] = {}
+        self._queue: list[tuple[float, str]] = []
+        self._polls: set[asyncio.Task[None]] = set()
+        self._runner: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def __aenter__(self) -> Self:
+        """Start polling when used as an async context manager."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop polling on exit."""
+        await self.async_stop()
+
+    def coordinator(self, host: str) -> ExoyOneCoordinator:
+        """Return the coordinator for a host, for registering listeners."""
+        if host not in self._coordinators:
+            self._coordinators[host] = ExoyOneCoordinator(
+                self._fleet[host], interval=self._interval
+            )
+        return self._coordinators[host]
+
+    def interval(self, host: str) -> float:
+        """Return the current polling interval for a host."""
+        return self._intervals.get(host, self._interval)
+
+    def next_poll(self, host: str) -> float | None:
+        """Return the number of seconds until a host is next polled."""
+        due = self._due.get(host)
+        return None if due is None else max(0.0, due - time.monotonic())
+
+    async def async_start(self) -> None:
+        """Start polling in the background."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop polling and wait for in-flight polls to be cancelled."""
+        tasks = list(self._polls)
+        if self._runner is not None:
+            tasks.append(self._runner)
+            self._runner = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._polls.clear()
+        self._queue.clear()
+        self._due.clear()
+        self._wakeup = None
+
+    def _schedule(self, host: str, delay: float) -> None:
+        """Schedule the next poll of a host after a jittered delay."""
+        spread = delay * self._jitter
+        due = time.monotonic() + max(0.0, delay + random.uniform(-spread, spread))
+        self._due[host] = due
+        heapq.heappush(self._queue, (due, host))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _sync_hosts(self) -> None:
+        """Stagger newly added hosts across the interval and drop removed ones."""
+        hosts = self._fleet.hosts
+        new_hosts = [host for host in hosts if host not in self._due]
+        for index, host in enumerate(new_hosts):
+            self._intervals[host] = self._interval
+            self._schedule(host, self._interval * index / len(new_hosts))
+        for host in set(self._due) - set(hosts):
+            self._due.pop(host)
+            self._intervals.pop(host, None)
+            self._coordinators.pop(host, None)
+
+    async def _async_run(self) -> None:
+        """Poll each host when it is due, within the concurrency limit."""
+        limit = asyncio.Semaphore(self._concurrency)
+        wakeup = self._wakeup = asyncio.Event()
+        while True:
+            self._sync_hosts()
+            wakeup.clear()
+
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                due, host = heapq.heappop(self._queue)
+                if self._due.get(host) != due:
+                    continue  # Superseded or removed.
+                task = asyncio.create_task(self._async_poll(host, limit))
+                self._polls.add(task)
+                task.add_done_callback(self._polls.discard)
+
+            delay = self._queue[0][0] - now if self._queue else self._interval
+            try:
+                async with asyncio.timeout(delay):
+                    await wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _async_poll(self, host: str, limit: asyncio.Semaphore) -> None:
+        """Poll a host and schedule its next poll, even if this one failed."""
+        changes: StateChanges = {}
+        try:
+            async with limit:
+                changes = await self.coordinator(host).async_refresh()
+        except (ExoyOneException, ValueError) as exc:
+            _LOGGER.warning("Error polling %s: %s", host, exc)
+        finally:
+            self._reschedule(host, changes)
+
+    def _reschedule(self, host: str, changes: StateChanges) -> None:
+        """Adapt the interval of a host to whether it changed and schedule it."""
+        interval = self._intervals.get(host, self._interval)
+        # The first poll reports every field as changed from None.
+        if any(old is not None for old, _ in changes.values()):
+            interval = self._min_interval
+        else:
+            interval = min(
+                max(interval, self._min_interval) * self._backoff, self._max_interval
+            )
+        if host in self._due:
+            self._intervals[host] = interval
+            self._schedule(host, interval)
@@ -0,0 +1,114 @@
+"""Prioritised sending of datagrams to an ExoyOne."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+
+from .models import ExoyOneException, ExoyOnePriority
+from .ratelimit import TokenBucket
+
+_LOGGER = logging.getLogger(__package__)
+
+
+@dataclass
+class QueueStats:
+    """Counters for the send queue."""
+
+    depth: int = 0
+    max_depth: int = 0
+    waited: int = 0
+    wait_time: float = 0.0
+    dropped: int = 0
+
+
+class SendQueue:
+    """
+    Hand out turns to send, highest priority first.
+
+    Senders only queue when the rate limit is holding sends back or others
+    are already waiting, so uncontended sends go straight out. A queued
+    sender that has a key is dropped when a newer sender with the same key
+    joins the queue, so only the latest streamed update is sent.
+    """
+
+    def __init__(self, limiter: TokenBucket | None = None) -> None:
+        """Initialize an empty queue."""
+        self._limiter = limiter
+        self._heap: list[tuple[int, int, asyncio.Future[bool]]] = []
+        self._keyed: dict[str, asyncio.Future[bool]] = {}
+        self._counter = itertools.count()
+        self._drainer: asyncio.Task[None] | None = None
+        self.stats = QueueStats()
+
+    def _ready(self) -> bool:
+        """Return True if a datagram could be sent right now."""
+        return self._limiter is None or self._limiter.delay() <= 0
+
+    async def async_turn(
+        self, priority: ExoyOnePriority, key: str | None = None
+    ) -> bool:
+        """Wait for a turn to send; return False if a newer send superseded it."""
+        if not self._heap and self._ready():
+            if self._limiter is not None:
+                await self._limiter.async_acquire()
+            return True
+
+        turn: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        if key is not None:
+            previous = self._keyed.get(key)
+            if previous is not None and not previous.done():
+                previous.set_result(False)
+                self.stats.dropped += 1
+            self._keyed[key] = turn
+        heapq.heappush(self._heap, (priority, next(self._counter), turn))
+        self.stats.depth += 1
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._async_drain())
+
+        queued_at = time.monotonic()
+        try:
+            return await turn
+        finally:
+            turn.cancel()
+            self.stats.depth -= 1
+            self.stats.waited += 1
+            self.stats.wait_time += time.monotonic() - queued_at
+            if key is not None and self._keyed.get(key) is turn:
+                del self._keyed[key]
+
+    async def _async_drain(self) -> None:
+        """Give the next turn to the highest priority sender still waiting."""
+        while self._heap:
+            if self._limiter is not None:
+                await self._limiter.async_wait()
+            while self._heap:
+                _, _, turn = heapq.heappop(self._heap)
+                if not turn.done():
+                    if self._limiter is not None:
+                        await self._limiter.async_acquire()
+                    turn.set_result(True)
+                    break
+            # Let the sender go before handing out the next turn.
+            await asyncio.sleep(0)
+
+    def close(self) -> None:
+        """
+        Stop handing out turns and release every waiting sender.
+
+        Waiting senders raise ExoyOneException rather than being cancelled, so
+        closing the queue is not mistaken for cancellation of their tasks.
+        """
+        if self._drainer is not None:
+            self._drainer.cancel()
+            self._drainer = None
+        for _, _, turn in self._heap:
+            if not turn.done():
+                turn.set_exception(ExoyOneException("Send queue closed"))
+        self._heap.clear()
+        self._keyed.clear()
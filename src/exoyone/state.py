@@ -3,18 +3,68 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, fields
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, replace
+from operator import attrgetter, itemgetter
+from typing import Any
 
 from camel_converter import to_snake
 
-from exoyone.models import mode_packs
+from exoyone.models import ExoyOneRequest, ExoyOneValueError, mode_packs
 
 _LOGGER = logging.getLogger(__package__)
 
+StateChanges = dict[str, tuple[bool | int | str | None, bool | int | str]]
 
-@dataclass
+REQUEST_FIELDS: dict[str, str] = {
+    "setBrightness": "brightness",
+    "setModPack": "currentModpack",
+    "setEffect": "modeIndex",
+    "setSpeed": "speed",
+    "setHue": "hue",
+    "setSaturation": "saturation",
+    "toggleModeCycle": "autoChange",
+    "toggleMusicSync": "musicSync",
+    "togglePower": "fadingOff",
+    "toggleSceneGeneration": "sceneGeneration",
+    "toggleDirection": "direction",
+    "setName": "userDefinedName",
+    "setCycleSpeed": "cycleSpeed",
+    "setShutdownTimer": "shutdownTimer",
+    "poweredByPowerbank": "poweredByPowerbank",
+    "setPattern": "selectedPattern",
+    "setRenderMode": "selectedRenderMode",
+    "setColorMode": "selectedColorMode",
+    "setPalette": "selectedPalette",
+}
+
+
+def expected_fields(request: ExoyOneRequest) -> dict[str, bool | int | str]:
+    """Return the state fields and values a request is expected to produce."""
+    expected: dict[str, bool | int | str] = {}
+    for key, value in request.items():
+        field_name = REQUEST_FIELDS.get(key)
+        if field_name is None:
+            continue
+        if key.startswith("toggle") or key == "poweredByPowerbank":
+            expected[field_name] = bool(value)
+        elif key == "setShutdownTimer" and isinstance(value, Mapping):
+            hours = int(value.get("hours", 0))
+            minutes = int(value.get("minutes", 0))
+            expected[field_name] = (hours * 60 + minutes) * 60
+        elif isinstance(value, bool | int | str):
+            expected[field_name] = value
+    return expected
+
+
+@dataclass(frozen=True, slots=True)
 class ExoyOneState:
-    """ExoyOne state data model."""
+    """
+    ExoyOne state data model.
+
+    States are immutable, so one snapshot can be shared by every reader.
+    Reply keys that are not known fields are kept in extra.
+    """
 
     mdnsName: str
     type: int
@@ -42,6 +92,27 @@ class ExoyOneState:
     connectedToWiFi: bool
     firmwareVersion: str
     poweredByPowerbank: bool
+    extra: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_reply(cls, data: Mapping[str, Any]) -> ExoyOneState:
+        """Return the state for a decoded getData reply."""
+        try:
+            values = _reply_values(data)
+        except KeyError as exc:
+            missing = sorted(_FIELD_SET - data.keys())
+            raise ExoyOneValueError(f"Reply is missing {', '.join(missing)}") from exc
+        extra = {}
+        if len(data) != len(_FIELD_NAMES):
+            extra = {key: value for key, value in data.items() if key not in _FIELD_SET}
+
+        # Fill the slots directly, as the frozen __init__ goes through
+        # object.__setattr__ for every field.
+        state = object.__new__(cls)
+        for set_slot, value in zip(_slot_setters, values, strict=True):
+            set_slot(state, value)
+        _set_extra(state, extra)
+        return state
 
     @property
     def friendly(self) -> dict[str, dict[str, int | str | tuple[int, int, int]]]:
@@ -82,9 +153,52 @@ class ExoyOneState:
             },
         }
 
+    def with_request(self, request: ExoyOneRequest) -> ExoyOneState:
+        """Return a copy of the state with the request optimistically applied."""
+        return replace(self, **expected_fields(request))
+
+    def matches(self, expected: Mapping[str, bool | int | str]) -> bool:
+        """Return True if every expected field has the expected value."""
+        return all(getattr(self, name) == value for name, value in expected.items())
+
+    def diff(self, previous: ExoyOneState | None) -> StateChanges:
+        """
+        Return the fields that differ from a previous state as (old, new).
+
+        Without a previous state every field is returned with an old value of
+        None. Comparing a state with itself, or with one holding the same
+        values, returns nothing without checking each field.
+        """
+        if previous is self:
+            return {}
+        values = _field_values(self)
+        if previous is None:
+            return {
+                name: (None, value)
+                for name, value in zip(_FIELD_NAMES, values, strict=True)
+            }
+        old_values = _field_values(previous)
+        if old_values == values:
+            return {}
+        return {
+            name: (old, new)
+            for name, old, new in zip(_FIELD_NAMES, old_values, values, strict=True)
+            if old != new
+        }
+
     def as_dict(self) -> dict[str, bool | int | str]:
         """Return fields in snake_case as a dictionary."""
         return {
-            to_snake(dc_field.name): getattr(self, dc_field.name)
-            for dc_field in fields(self)
+            to_snake(name): value
+            for name, value in zip(_FIELD_NAMES, _field_values(self), strict=True)
         }
+
+
+_FIELD_NAMES = tuple(
+    state_field.name for state_field in fields(ExoyOneState) if state_field.compare
+)
+_FIELD_SET = frozenset(_FIELD_NAMES)
+_field_values = attrgetter(*_FIELD_NAMES)
+_reply_values = itemgetter(*_FIELD_NAMES)
+_slot_setters = tuple(vars(ExoyOneState)[name].__set__ for name in _FIELD_NAMES)
+_set_extra = vars(ExoyOneState)["extra"].__set__
@@ -0,0 +1,117 @@
+"""Smooth colour transitions streamed to an ExoyOne."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .exoyone import ExoyOne
+
+_LOGGER = logging.getLogger(__package__)
+
+HSB = tuple[int, int, int]
+HSB_KEYS = ("setHue", "setSaturation", "setBrightness")
+
+
+@dataclass
+class TransitionStats:
+    """Counters for a transition."""
+
+    sent: int = 0
+    dropped: int = 0
+    superseded: bool = False
+
+
+def interpolate_hsb(start: HSB, end: HSB, progress: float) -> HSB:
+    """
+    Return the colour a fraction of the way from start to end.
+
+    Hue takes the shorter way around the colour wheel.
+    """
+    hue_delta = (end[0] - start[0] + 128) % 256 - 128
+    return (
+        round(start[0] + hue_delta * progress) % 256,
+        round(start[1] + (end[1] - start[1]) * progress),
+        round(start[2] + (end[2] - start[2]) * progress),
+    )
+
+
+class ExoyOneTransition:
+    """
+    Stream interpolated colour frames to an ExoyOne at a target frame rate.
+
+    Frames are paced at the slower of the frame rate and the device's
+    smoothed round-trip time. Each frame is the colour for the moment it is
+    sent, so when sending falls behind the missed frames are dropped rather
+    than queued. Frames only carry the components that changed and are not
+    verified; the final colour is sent as an optimistic write that is.
+    """
+
+    def __init__(
+        self, exoyone: ExoyOne, start: HSB, end: HSB, duration: float, fps: float
+    ) -> None:
+        """Initialize the transition without starting it."""
+        self._exoyone = exoyone
+        self._start = start
+        self._end = end
+        self._duration = duration
+        self._fps = fps
+        self.stats = TransitionStats()
+
+    @property
+    def frame_interval(self) -> float:
+        """Return the time between frames, paced against the device latency."""
+        return max(1 / self._fps, self._exoyone.rtt.srtt or 0.0)
+
+    async def async_run(self, is_current: Callable[[], bool]) -> TransitionStats:
+        """
+        Send frames until the transition completes or is superseded.
+
+        The is_current callable is checked before every frame, so a newer
+        transition on the same device stops this one.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        next_frame = started
+        sent = self._start
+
+        while (elapsed := loop.time() - started) < self._duration:
+            if not is_current():
+                self.stats.superseded = True
+                return self.stats
+
+            frame = interpolate_hsb(self._start, self._end, elapsed / self._duration)
+            request = {
+                key: value
+                for key, value, previous in zip(HSB_KEYS, frame, sent, strict=True)
+                if value != previous
+            }
+            if request:
+                try:
+                    delivered = await self._exoyone.async_send_frame(request)
+                except TimeoutError:
+                    delivered = False
+                if delivered:
+                    self.stats.sent += 1
+                    sent = frame
+                else:
+                    self.stats.dropped += 1
+
+            interval = self.frame_interval
+            next_frame += interval
+            now = loop.time()
+            if next_frame < now:
+                # Fell behind: skip to the next frame due rather than catch up.
+                missed = int((now - next_frame) // interval) + 1
+                self.stats.dropped += missed
+                next_frame += missed * interval
+            await asyncio.sleep(next_frame - now)
+
+        if not is_current():
+            self.stats.superseded = True
+        return self.stats
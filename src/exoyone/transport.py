@@ -0,0 +1,331 @@
+"""Persistent datagram transports for ExoyOne devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import time
+from collections import deque
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
+
+import asyncio_dgram
+
+if TYPE_CHECKING:
+    from asyncio_dgram import DatagramClient, DatagramServer
+
+_LOGGER = logging.getLogger(__package__)
+
+
+def _owned_by_running_loop(loop: asyncio.AbstractEventLoop | None) -> bool:
+    """Return True if the loop is the running loop (or open, outside a loop)."""
+    if loop is None:
+        return False
+    try:
+        return loop is asyncio.get_running_loop()
+    except RuntimeError:
+        return not loop.is_closed()
+
+
+def _close_stream(stream: DatagramClient | DatagramServer | None) -> None:
+    """Close a datagram stream, ignoring streams of loops that have closed."""
+    if stream is None:
+        return
+    try:
+        stream.close()
+    except RuntimeError:
+        # The event loop that owned the endpoint has already been closed.
+        pass
+
+
+class ExoyOneReply(NamedTuple):
+    """A datagram from a device, matched to the request it answers."""
+
+    data: bytes
+    sent_at: float
+    received_at: float
+
+
+class ExoyOneTransport:
+    """
+    A long-lived datagram endpoint connected to a single ExoyOne.
+
+    Replies carry no request identifier, but the device answers requests in
+    the order they arrive. Each request that expects a reply is recorded with
+    its send time and replies are matched to them oldest first, skipping
+    requests older than the reply lifetime, which are taken to have been
+    lost. Requests that were given up on stay outstanding, so a late reply
+    is still matched to its own request. Datagrams that arrive when no
+    request is outstanding, such as duplicates, are dropped.
+    """
+
+    REQUEST_LIFETIME: ClassVar[float] = 5.0
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize the transport without opening the endpoint."""
+        self._host = host
+        self._port = port
+        self._stream: DatagramClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._queue: asyncio.Queue[tuple[bytes, float]] | None = None
+        self._outstanding: deque[float] = deque()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the endpoint is open on the running event loop."""
+        return self._stream is not None and _owned_by_running_loop(self._loop)
+
+    async def async_open(self) -> None:
+        """Open the endpoint, (re)connecting if required."""
+        await self._async_stream()
+
+    async def _async_stream(self) -> DatagramClient:
+        """Return the open endpoint, (re)connecting if required."""
+        if self._stream is not None and not self.is_open:
+            # The endpoint belongs to a loop that is no longer running.
+            self.close()
+
+        if self._stream is None:
+            _LOGGER.debug("Opening datagram endpoint to %s:%s", self._host, self._port)
+            self._stream = await asyncio_dgram.connect((self._host, self._port))
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+            self._reader = asyncio.create_task(
+                self._async_receive(self._stream, self._queue)
+            )
+
+        return self._stream
+
+    def close(self) -> None:
+        """Close the endpoint if it is open."""
+        if self._reader is not None and _owned_by_running_loop(self._loop):
+            self._reader.cancel()
+        self._reader = None
+        self._queue = None
+        self._outstanding.clear()
+        stream, self._stream = self._stream, None
+        self._loop = None
+        _close_stream(stream)
+
+    def discard_pending(self, lifetime: float | None = None) -> int:
+        """
+        Drop replies that arrived after their request gave up.
+
+        Each reply is still matched to its request first, so replies that are
+        yet to arrive are matched to their own requests rather than newer ones.
+        """
+        discarded = 0
+        while self._queue is not None and not self._queue.empty():
+            _, received_at = self._queue.get_nowait()
+            self._match(received_at, lifetime)
+            discarded += 1
+        return discarded
+
+    def _match(self, received_at: float, lifetime: float | None) -> float | None:
+        """Return the send time of the request a reply answers, if any."""
+        if lifetime is None:
+            lifetime = self.REQUEST_LIFETIME
+        outstanding = self._outstanding
+        while outstanding and outstanding[0] < received_at - lifetime:
+            outstanding.popleft()
+        if outstanding and outstanding[0] <= received_at:
+            return outstanding.popleft()
+        return None
+
+    async def _async_receive(
+        self, stream: DatagramClient, queue: asyncio.Queue[tuple[bytes, float]]
+    ) -> None:
+        """Move received datagrams onto the queue until the endpoint dies."""
+        while True:
+            try:
+                data, _ = await stream.recv()
+            except (asyncio_dgram.TransportClosed, OSError) as exc:
+                _LOGGER.debug("Datagram endpoint to %s died: %s", self._host, exc)
+                if self._stream is stream:
+                    # Reconnect on the next send.
+                    self._stream = None
+                    _close_stream(stream)
+                return
+            queue.put_nowait((data, time.monotonic()))
+
+    async def async_send(
+        self, payload: bytes, timeout: float, expects_reply: bool = False
+    ) -> float:
+        """Send a datagram and return when it was sent."""
+        sent_at = time.monotonic()
+        await self._async_send_datagram(payload, timeout)
+        if expects_reply:
+            self._outstanding.append(sent_at)
+        return sent_at
+
+    async def async_recv(
+        self, timeout: float, lifetime: float | None = None
+    ) -> ExoyOneReply:
+        """
+        Wait for the next reply from the device.
+
+        Requests sent more than lifetime seconds before a reply arrives are
+        taken to have been lost, defaulting to REQUEST_LIFETIME.
+        """
+        queue = await self._async_reply_queue()
+        async with asyncio.timeout(timeout):
+            while True:
+                data, received_at = await queue.get()
+                sent_at = self._match(received_at, lifetime)
+                if sent_at is not None:
+                    return ExoyOneReply(data, sent_at, received_at)
+                _LOGGER.debug("Dropping unsolicited datagram from %s", self._host)
+
+    async def _async_send_datagram(self, payload: bytes, timeout: float) -> None:
+        """Send a datagram, reconnecting once if the endpoint has died."""
+        try:
+            stream = await self._async_stream()
+            await asyncio.wait_for(stream.send(payload), timeout=timeout)
+        except TimeoutError:
+            raise
+        except (asyncio_dgram.TransportClosed, OSError) as exc:
+            _LOGGER.debug("Reconnecting to %s after error: %s", self._host, exc)
+            self.close()
+            stream = await self._async_stream()
+            await asyncio.wait_for(stream.send(payload), timeout=timeout)
+
+    async def _async_reply_queue(self) -> asyncio.Queue[tuple[bytes, float]]:
+        """Return the queue of received datagrams and when they arrived."""
+        await self._async_stream()
+        if self._queue is None:
+            raise TimeoutError()
+        return self._queue
+
+
+class ExoyOneSharedTransport:
+    """A single datagram endpoint shared by many ExoyOne devices."""
+
+    def __init__(self, local_addr: tuple[str, int] = ("0.0.0.0", 0)) -> None:  # noqa: S104
+        """Initialize the shared transport without binding the endpoint."""
+        self._local_addr = local_addr
+        self._stream: DatagramServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._routes: dict[tuple[str, int], asyncio.Queue[tuple[bytes, float]]] = {}
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the endpoint is bound on the running event loop."""
+        return self._stream is not None and _owned_by_running_loop(self._loop)
+
+    def channel(self, host: str, port: int = 8888) -> ExoyOneSharedChannel:
+        """Return a per-device channel that uses this endpoint."""
+        return ExoyOneSharedChannel(self, host, port)
+
+    async def async_open(self) -> None:
+        """Bind the endpoint and start routing replies, if required."""
+        await self._async_stream()
+
+    async def _async_stream(self) -> DatagramServer:
+        """Return the bound endpoint, binding it if required."""
+        if self._stream is not None and not self.is_open:
+            self.close()
+
+        if self._stream is None:
+            self._stream = await asyncio_dgram.bind(self._local_addr)
+            self._loop = asyncio.get_running_loop()
+            self._reader = asyncio.create_task(self._async_route(self._stream))
+            _LOGGER.debug("Shared datagram endpoint bound to %s", self._stream.sockname)
+
+        return self._stream
+
+    def close(self) -> None:
+        """Close the endpoint and drop all routes."""
+        if self._reader is not None and _owned_by_running_loop(self._loop):
+            self._reader.cancel()
+        self._reader = None
+        stream, self._stream = self._stream, None
+        self._loop = None
+        self._routes.clear()
+        _close_stream(stream)
+
+    def register(self, addr: tuple[str, int]) -> asyncio.Queue[tuple[bytes, float]]:
+        """Return the queue that receives datagrams from an address."""
+        if addr not in self._routes:
+            self._routes[addr] = asyncio.Queue()
+        return self._routes[addr]
+
+    def unregister(self, addr: tuple[str, int]) -> None:
+        """Stop routing datagrams from an address."""
+        self._routes.pop(addr, None)
+
+    async def async_send(
+        self, payload: bytes, addr: tuple[str, int], timeout: float
+    ) -> None:
+        """Send a datagram to an address."""
+        stream = await self._async_stream()
+        await asyncio.wait_for(stream.send(payload, addr), timeout=timeout)
+
+    async def _async_route(self, stream: DatagramServer) -> None:
+        """Deliver each received datagram to the queue for its source address."""
+        while True:
+            try:
+                data, addr = await stream.recv()
+            except asyncio_dgram.TransportClosed:
+                return
+            except OSError as exc:
+                _LOGGER.debug("Error on shared datagram endpoint: %s", exc)
+                continue
+
+            queue = self._routes.get(addr[:2])
+            if queue is None:
+                _LOGGER.debug("Dropping datagram from unknown address %s", addr)
+                continue
+            queue.put_nowait((data, time.monotonic()))
+
+
+class ExoyOneSharedChannel(ExoyOneTransport):
+    """A per-device view of an ExoyOneSharedTransport."""
+
+    def __init__(self, shared: ExoyOneSharedTransport, host: str, port: int) -> None:
+        """Initialize the channel without resolving the device address."""
+        super().__init__(host, port)
+        self._shared = shared
+        self._addr: tuple[str, int] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the channel is routed on an open shared endpoint."""
+        return self._queue is not None and self._shared.is_open
+
+    async def async_open(self) -> None:
+        """Open the shared endpoint and route replies from the device here."""
+        await self._async_route_here()
+
+    async def _async_route_here(
+        self,
+    ) -> tuple[tuple[str, int], asyncio.Queue[tuple[bytes, float]]]:
+        """Return the device address and the queue its replies are routed to."""
+        await self._shared.async_open()
+        if self._addr is None:
+            loop = asyncio.get_running_loop()
+            info = await loop.getaddrinfo(
+                self._host, self._port, family=socket.AF_INET, type=socket.SOCK_DGRAM
+            )
+            host, port = info[0][4][:2]
+            self._addr = (str(host), int(port))
+        self._queue = self._shared.register(self._addr)
+        return self._addr, self._queue
+
+    def close(self) -> None:
+        """Stop routing replies from the device; the shared endpoint stays open."""
+        if self._addr is not None and self._queue is not None:
+            self._shared.unregister(self._addr)
+        self._queue = None
+        self._outstanding.clear()
+
+    async def _async_send_datagram(self, payload: bytes, timeout: float) -> None:
+        """Send a datagram to the device."""
+        addr, _ = await self._async_route_here()
+        await self._shared.async_send(payload, addr, timeout)
+
+    async def _async_reply_queue(self) -> asyncio.Queue[tuple[bytes, float]]:
+        """Return the queue that replies from the device are routed to."""
+        _, queue = await self._async_route_here()
+        return queue
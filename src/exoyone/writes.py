@@ -0,0 +1,63 @@
+"""Verification of writes to an ExoyOne, setting by setting."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .state import expected_fields
+
+if TYPE_CHECKING:
+    from .state import ExoyOneState
+
+_LOGGER = logging.getLogger(__package__)
+
+# The effect index depends on the mode pack, so they are always resent together.
+_COUPLED_KEYS = frozenset({"setModPack", "setEffect"})
+
+
+@dataclass(eq=False)
+class ExoyOneWrite:
+    """
+    A request sent to an ExoyOne and its verification.
+
+    Every setting in the request is checked against the state read back
+    afterwards, and results records whether each one took. Settings that did
+    not take can be resent on their own. Settings that cannot be read back,
+    such as restartInApMode, are sent but not verified.
+    """
+
+    request: dict[str, Any]
+    confirmation: asyncio.Future[bool]
+    written_at: float
+    resends: int = 0
+    results: dict[str, bool] = field(default_factory=dict)
+    expected: dict[str, dict[str, bool | int | str]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Work out the state fields each setting is expected to produce."""
+        self.expected = {
+            key: fields
+            for key, value in self.request.items()
+            if (fields := expected_fields({key: value}))
+        }
+
+    @property
+    def fields(self) -> dict[str, bool | int | str]:
+        """Return every state field and value the request is expected to produce."""
+        return {
+            name: value
+            for fields in self.expected.values()
+            for name, value in fields.items()
+        }
+
+    def check(self, state: ExoyOneState | None) -> dict[str, Any]:
+        """Record which settings took and return a request for any that did not."""
+        for key, fields in self.expected.items():
+            self.results[key] = state is not None and state.matches(fields)
+        failed = {key for key, took in self.results.items() if not took}
+        if failed & _COUPLED_KEYS:
+            failed |= _COUPLED_KEYS
+        return {key: value for key, value in self.request.items() if key in failed}
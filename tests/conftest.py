@@ -32,6 +32,7 @@ async def exoyone() -> AsyncGenerator[ExoyOne, None]:
     exoyone = ExoyOne(host="127.0.0.1")
     await exoyone.async_get_data()
     yield exoyone
+    exoyone.close()
 
 
 @pytest.fixture(scope="class")
@@ -1,13 +1,24 @@
 # type: ignore
 
+import asyncio
+import dataclasses
+import json
 import random
+import time
 from unittest.mock import patch
 
+import asyncio_dgram
 import pytest
 
 from exoyone import ExoyOne, ExoyOneState
-from exoyone.models import ExoyOneTimeoutError, ExoyOneValueError, TruthyFalsyWords
+from exoyone.models import (
+    ExoyOneException,
+    ExoyOneTimeoutError,
+    ExoyOneValueError,
+    TruthyFalsyWords,
+)
 from exoyone.models import mode_packs as mp
+from exoyone.transport import ExoyOneReply
 
 word_test_params = [
     (word.lower(), bool(TruthyFalsyWords[word].value))
@@ -37,18 +48,411 @@ class TestExoyOne:
         assert isinstance(exoyone_state, ExoyOneState)
         assert exoyone_state == exoyone.state
 
+    async def test_state_diff(self, exoyone):
+        """Test changed fields are reported and identical replies are reused."""
+        state = await exoyone.async_get_state()
+        assert await exoyone.async_get_state() is state
+        assert state.diff(state) == {}
+
+        initial = state.diff(None)
+        assert len(initial) == 26
+        assert initial["hue"] == (None, state.hue)
+
+        new_hue = (state.hue + 1) % 256
+        await exoyone.set_hue(new_hue)
+        assert exoyone.state.diff(state) == {"hue": (state.hue, new_hue)}
+        assert state.diff(exoyone.state) == {"hue": (new_hue, state.hue)}
+        assert exoyone.state.with_request({"setHue": state.hue}).diff(state) == {}
+
+    async def test_state_from_reply(self, exoyone):
+        """Test states are immutable and tolerate unknown reply keys."""
+        state = exoyone.state
+        reply = {
+            state_field.name: getattr(state, state_field.name)
+            for state_field in dataclasses.fields(state)
+            if state_field.name != "extra"
+        }
+        assert ExoyOneState.from_reply(reply) == state
+        assert not hasattr(state, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            state.hue = 1
+
+        newer = ExoyOneState.from_reply({**reply, "newFeature": 1})
+        assert newer == state
+        assert newer.extra == {"newFeature": 1}
+        assert "extra" not in newer.as_dict()
+
+        del reply["hue"]
+        with pytest.raises(ExoyOneValueError, match="hue"):
+            ExoyOneState.from_reply(reply)
+
+    async def test_persistent_endpoint(self):
+        """Test the datagram endpoint is reused and reopened when it dies."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            await exoyone.async_get_data()
+            stream = exoyone._transport._stream
+            await exoyone.async_get_data()
+            assert exoyone._transport._stream is stream
+
+            stream.close()
+            await exoyone.async_get_data()
+            assert exoyone._transport._stream is not None
+            assert exoyone._transport._stream is not stream
+
+        assert exoyone._transport._stream is None
+
+    async def test_optimistic_write(self):
+        """Test optimistic writes update the state and verify in the background."""
+        async with ExoyOne(host="127.0.0.1", optimistic=True) as exoyone:
+            await exoyone.async_get_data()
+            new_hue = (exoyone.state.hue + 1) % 256
+            confirmation = await exoyone.async_set_data({"setHue": new_hue})
+            assert exoyone.state.hue == new_hue
+            assert not confirmation.done()
+            assert await confirmation is True
+
+    async def test_optimistic_write_on_demand(self):
+        """Test optimistic writes can be verified on demand."""
+        async with ExoyOne(
+            host="127.0.0.1", optimistic=True, verify_in_background=False
+        ) as exoyone:
+            await exoyone.async_get_data()
+            new_speed = (exoyone.state.speed + 1) % 256
+            confirmation = await exoyone.async_set_data({"setSpeed": new_speed})
+            await exoyone.set_shutdown_timer(90)
+            assert exoyone.state.speed == new_speed
+            assert exoyone.state.shutdownTimer == 5400
+
+            await asyncio.sleep(exoyone.SETTLE_TIME)
+            assert await exoyone.async_confirm_writes() is True
+            assert confirmation.result() is True
+            assert await exoyone.async_confirm_writes() is True
+            await exoyone.set_shutdown_timer(0)
+
+    async def test_coalesced_writes(self):
+        """Test writes within the coalescing window are sent as one request."""
+        async with ExoyOne(host="127.0.0.1", coalesce_window=0.05) as exoyone:
+            await exoyone.async_get_data()
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                await asyncio.gather(
+                    exoyone.set_hue(10),
+                    exoyone.set_hue(20),
+                    exoyone.set_brightness(30),
+                )
+
+            payloads = [call.args[0] for call in mock_send.call_args_list]
+            assert payloads.count(b'{"getData": 1}') == 1
+            assert (
+                exoyone._codec.encode({"setHue": 20, "setBrightness": 30}) in payloads
+            )
+            assert len(payloads) == 2
+            assert exoyone.state.hue == 20
+            assert exoyone.state.brightness == 30
+
+    async def test_coalesced_modes(self):
+        """Test a coalesced write is read back if any caller asked for it."""
+        async with ExoyOne(
+            host="127.0.0.1", coalesce_window=0.05, verify_in_background=False
+        ) as exoyone:
+            await exoyone.async_get_data()
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                await asyncio.gather(
+                    exoyone.async_set_data({"setHue": 40}, optimistic=True),
+                    exoyone.async_set_data({"setBrightness": 50}, optimistic=False),
+                )
+
+            payloads = [call.args[0] for call in mock_send.call_args_list]
+            assert payloads[-1] == b'{"getData": 1}'
+            assert len(payloads) == 2
+
+    async def test_close_during_coalesce(self):
+        """Test writes waiting to be coalesced fail when the device is closed."""
+        async with ExoyOne(host="127.0.0.1", coalesce_window=0.2) as exoyone:
+            write = asyncio.create_task(exoyone.set_hue(10))
+            await asyncio.sleep(0.05)
+        with pytest.raises(ExoyOneException, match="closed"):
+            await write
+        assert not write.cancelled()
+
+    async def test_batch(self, exoyone):
+        """Test settings made in a batch are sent as one request."""
+        transport = exoyone._transport
+        hue = (exoyone.state.hue + 1) % 256
+        with patch.object(
+            transport, "async_send", wraps=transport.async_send
+        ) as mock_send:
+            async with exoyone.batch() as batch:
+                await batch.set_effect("Hypnosis")
+                await batch.set_color((hue, 200, 100))
+                await batch.set_speed(42)
+                await batch.toggle_music_sync(True)
+                assert mock_send.call_count == 0
+                assert batch.request["setSpeed"] == 42
+
+        payloads = [call.args[0] for call in mock_send.call_args_list]
+        assert payloads[1:] == [b'{"getData": 1}']
+        assert await batch.confirmation is True
+        assert exoyone.state.modeIndex == 3
+        assert exoyone.state.hue == hue
+        assert exoyone.state.speed == 42
+        assert exoyone.state.musicSync is True
+
+    async def test_batch_per_device(self, exoyone):
+        """Test nested batches only collect settings for their own device."""
+        async with ExoyOne(host="127.0.0.1") as other:
+            await other.async_get_data()
+            async with exoyone.batch() as batch:
+                async with other.batch() as other_batch:
+                    await exoyone.set_speed(40)
+                    await other.set_speed(41)
+                    assert batch.device is exoyone
+                    assert batch.request == {"setSpeed": 40}
+                    assert other_batch.request == {"setSpeed": 41}
+
+            assert await other_batch.confirmation is True
+            assert await batch.confirmation is True
+            assert exoyone.state.speed == 40
+
+    async def test_batch_error(self, exoyone):
+        """Test nothing is sent if the batch raises, and other tasks are not batched."""
+        hue = (exoyone.state.hue + 1) % 256
+        release = asyncio.Event()
+
+        async def _set_hue_elsewhere():
+            await release.wait()
+            await exoyone.set_hue(hue)
+
+        elsewhere = asyncio.create_task(_set_hue_elsewhere())
+        with pytest.raises(RuntimeError):
+            async with exoyone.batch() as batch:
+                await batch.set_speed(5)
+                release.set()
+                await elsewhere
+                assert exoyone.state.hue == hue
+                raise RuntimeError()
+
+        assert batch.confirmation.cancelled()
+        assert exoyone.state.speed != 5
+
+    async def test_rate_limit(self):
+        """Test sends are rate limited and throttled writes are merged."""
+        async with ExoyOne(
+            host="127.0.0.1", rate_limit=20, burst=2, verify_in_background=False
+        ) as exoyone:
+            for _ in range(4):
+                await exoyone.async_get_data()
+            assert exoyone.throttle_stats.throttled == 2
+            assert exoyone.throttle_stats.throttled_time >= 0.05
+
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                await asyncio.gather(
+                    exoyone.async_set_data({"setHue": 30}, optimistic=True),
+                    exoyone.async_set_data({"setSpeed": 20}, optimistic=True),
+                    exoyone.async_set_data({"setHue": 40}, optimistic=True),
+                )
+
+            payloads = [call.args[0] for call in mock_send.call_args_list]
+            assert payloads == [
+                exoyone._commands.encode({"setHue": 40, "setSpeed": 20})
+            ]
+            assert exoyone.throttle_stats.throttled == 3
+            assert exoyone.queue_stats.depth == 0
+
+    async def test_single_flight_reads(self, exoyone):
+        """Test concurrent reads share a single request."""
+        transport = exoyone._transport
+        with patch.object(
+            transport, "async_send", wraps=transport.async_send
+        ) as mock_send:
+            states = await asyncio.gather(
+                *(exoyone.async_get_state() for _ in range(10))
+            )
+
+        assert mock_send.call_count == 1
+        assert all(state is states[0] for state in states)
+
+    async def test_adaptive_timeout(self):
+        """Test the receive timeout adapts to the observed round-trip time."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            assert exoyone.timeout == exoyone.INITIAL_TIMEOUT
+            for _ in range(5):
+                await exoyone.async_get_data()
+
+            assert exoyone.rtt.samples == 5
+            assert exoyone.rtt.srtt is not None
+            assert exoyone.timeout < exoyone.INITIAL_TIMEOUT
+            assert exoyone.timeout >= exoyone.MIN_TIMEOUT
+
+    async def test_hedged_reads(self):
+        """Test a hedged getData is sent when the reply is slower than usual."""
+        async with ExoyOne(host="127.0.0.1", hedge=True) as exoyone:
+            for _ in range(exoyone.HEDGE_MIN_SAMPLES):
+                exoyone.rtt.observe(0.00001)
+
+            await exoyone.async_get_data()
+            assert exoyone.hedge_stats.fired == 1
+            assert exoyone.hedge_stats.won <= 1
+            assert exoyone.state.mdnsName.startswith("exoyone")
+
+            await exoyone.async_get_data()
+            assert exoyone.state.mdnsName.startswith("exoyone")
+
+    async def test_unsolicited_replies(self, exoyone):
+        """Test datagrams that answer no outstanding request are dropped."""
+        transport = exoyone._transport
+        transport._queue.put_nowait((b"duplicate", time.monotonic()))
+        sent_at = await transport.async_send(
+            b'{"getData": 1}', timeout=exoyone.TIMEOUT, expects_reply=True
+        )
+        reply = await transport.async_recv(timeout=exoyone.TIMEOUT)
+        assert reply.data != b"duplicate"
+        assert reply.sent_at == sent_at
+        assert reply.received_at >= sent_at
+
+        with pytest.raises(TimeoutError):
+            await transport.async_recv(timeout=0.05)
+
+    async def test_stale_replies(self):
+        """Test older replies never replace newer state or optimistic writes."""
+        async with ExoyOne(
+            host="127.0.0.1", optimistic=True, verify_in_background=False
+        ) as exoyone:
+            await exoyone.async_get_data()
+            state = exoyone.state
+            old_data = exoyone._reply[0]
+            read_at = exoyone._state_read_at
+
+            new_hue = (state.hue + 1) % 256
+            confirmation = await exoyone.async_set_data({"setHue": new_hue})
+
+            # A reply to a request sent before the write does not undo it.
+            exoyone._apply_reply(
+                ExoyOneReply(old_data, read_at + 0.001, time.monotonic())
+            )
+            assert exoyone.state.hue == new_hue
+            assert not confirmation.done()
+
+            # A reply to a request sent before the last read is ignored.
+            exoyone._apply_reply(ExoyOneReply(old_data, read_at - 1, time.monotonic()))
+            assert exoyone._state_read_at == read_at + 0.001
+
+            await asyncio.sleep(exoyone.SETTLE_TIME)
+            assert await exoyone.async_confirm_writes() is True
+            assert exoyone.state.hue == new_hue
+
+    async def test_late_reply(self, exoyone):
+        """Test a late reply to an abandoned read is not taken for a newer one."""
+        data = json.loads(exoyone._reply[0])
+        device = await asyncio_dgram.bind(("127.0.0.1", 0))
+        try:
+            async with ExoyOne(
+                host="127.0.0.1", port=device.sockname[1], circuit_breaker=False
+            ) as fake:
+                with pytest.raises(ExoyOneTimeoutError):
+                    with fake.deadline(0.2, retries=0):
+                        await fake.async_get_data()
+                while fake._read_flight is not None:
+                    await asyncio.sleep(0.01)
+                await device.recv()
+
+                read = asyncio.create_task(fake.async_get_data())
+                _, addr = await device.recv()
+                # The device answers in order: first the abandoned request.
+                await device.send(json.dumps({**data, "hue": 1}).encode(), addr)
+                await device.send(json.dumps({**data, "hue": 2}).encode(), addr)
+                await read
+                assert fake.state.hue == 2
+        finally:
+            device.close()
+
+    async def test_max_age(self):
+        """Test fresh cached state is returned without a round trip."""
+        async with ExoyOne(
+            host="127.0.0.1", max_age=60, verify_in_background=False
+        ) as exoyone:
+            state = await exoyone.async_get_state()
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                assert await exoyone.async_get_state() is state
+                assert mock_send.call_count == 0
+
+                assert await exoyone.async_get_state(max_age=0) == state
+                assert mock_send.call_count == 1
+
+                await exoyone.async_set_data({"setSpeed": 10}, optimistic=True)
+                assert (await exoyone.async_get_state()).speed == 10
+                assert mock_send.call_count == 2
+
+                await exoyone.async_set_data({"restartInApMode": True}, optimistic=True)
+                assert mock_send.call_count == 3
+                await exoyone.async_get_state()
+                assert mock_send.call_count == 4
+
+    async def test_close_during_read(self):
+        """Test reads waiting when the device is closed fail, not cancelled."""
+        async with ExoyOne(host="192.0.2.1") as exoyone:
+            reads = [asyncio.create_task(exoyone.async_get_data()) for _ in range(2)]
+            await asyncio.sleep(0.05)
+        for read in reads:
+            with pytest.raises(ExoyOneException, match="closed"):
+                await read
+            assert not read.cancelled()
+
     async def test_host(self, exoyone):
         """Test the host is set correctly."""
         assert exoyone.host == "127.0.0.1"
 
     async def test_host_error(self):
         """Test incorrect host config raises an exception."""
-        exoyone = ExoyOne(host="192.168.254.254")
-        with patch.object(exoyone, "TIMEOUT", 0.0):
-            with pytest.raises(ExoyOneTimeoutError):
-                await exoyone.async_get_data()
-            with pytest.raises(ExoyOneTimeoutError):
-                await exoyone.toggle_power(True)
+        async with ExoyOne(host="192.168.254.254") as exoyone:
+            with patch.object(exoyone, "TIMEOUT", 0.0):
+                with pytest.raises(ExoyOneTimeoutError):
+                    await exoyone.async_get_data()
+                with pytest.raises(ExoyOneTimeoutError):
+                    await exoyone.toggle_power(True)
+
+    async def test_deadline(self):
+        """Test nested operations share one deadline and retry budget."""
+        async with ExoyOne(host="192.0.2.1") as exoyone:
+            exoyone.rtt.sample(0.001)
+            with pytest.raises(ExoyOneTimeoutError, match="after 1 retries"):
+                with exoyone.deadline(retries=1) as deadline:
+                    await exoyone.async_get_data()
+            assert deadline.retried == 1
+
+            with exoyone.deadline(retries=0):
+                with pytest.raises(ExoyOneTimeoutError, match="after 0 retries"):
+                    with exoyone.deadline(retries=5):
+                        await exoyone.async_get_data()
+
+            started = time.monotonic()
+            with pytest.raises(ExoyOneTimeoutError, match=r"0\.2s deadline"):
+                with exoyone.deadline(0.2, retries=10):
+                    await exoyone.toggle_power(True)
+            assert time.monotonic() - started < 0.5
+
+    async def test_deadline_per_device(self, exoyone):
+        """Test a deadline only bounds operations on its own device."""
+        async with ExoyOne(host="192.0.2.1") as offline:
+            offline.rtt.sample(0.001)
+            with offline.deadline(retries=0) as deadline:
+                with exoyone.deadline(retries=3) as other_deadline:
+                    assert deadline.device is offline
+                    await exoyone.async_get_data()
+                    with pytest.raises(ExoyOneTimeoutError, match="after 0 retries"):
+                        await offline.async_get_data()
+            assert other_deadline.retried == 0
 
     async def test_device_type(self, exoyone):
         """Test the device type is returned."""
@@ -0,0 +1,105 @@
+# type: ignore
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOne, ExoyOneUnavailableError
+from exoyone.breaker import CircuitBreaker
+from exoyone.models import ExoyOneTimeoutError
+
+
+class TestCircuitBreaker:
+    """Test the CircuitBreaker class."""
+
+    def test_trip_and_close(self):
+        """Test consecutive failures open the breaker and a reply closes it."""
+        breaker = CircuitBreaker(threshold=2)
+        assert breaker.record_failure() is False
+        assert breaker.record_success(0.1) is False
+        assert breaker.stats.failures == 0
+
+        assert breaker.record_failure() is False
+        assert breaker.record_failure() is True
+        assert breaker.record_failure() is False
+        assert breaker.is_open
+        assert breaker.stats.trips == 1
+
+        assert breaker.record_success(0.2) is True
+        assert not breaker.is_open
+        assert breaker.stats.latency == pytest.approx(0.1 + breaker.ALPHA * 0.1)
+        assert breaker.stats.last_seen is not None
+
+    def test_no_threshold(self):
+        """Test a breaker without a threshold never opens."""
+        breaker = CircuitBreaker(threshold=None)
+        for _ in range(10):
+            assert breaker.record_failure() is False
+        assert not breaker.is_open
+        assert breaker.stats.failures == 10
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneCircuitBreaker:
+    """Test circuit breaking on the ExoyOne class."""
+
+    async def test_fail_fast(self):
+        """Test an offline device fails immediately once the breaker trips."""
+        async with ExoyOne(host="192.0.2.1") as exoyone:
+            exoyone.rtt.sample(0.001)
+            for _ in range(exoyone.FAILURE_THRESHOLD):
+                with pytest.raises(ExoyOneTimeoutError):
+                    with exoyone.deadline(retries=0):
+                        await exoyone.async_get_data()
+            assert not exoyone.available
+            assert exoyone.availability.trips == 1
+
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                started = time.monotonic()
+                with pytest.raises(ExoyOneUnavailableError):
+                    await exoyone.async_get_data()
+                with pytest.raises(ExoyOneUnavailableError):
+                    await exoyone.set_hue(10)
+                assert time.monotonic() - started < 0.1
+                assert mock_send.call_count == 0
+
+    async def test_probe(self):
+        """Test a background probe closes the breaker once the device replies."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            with patch.object(exoyone, "PROBE_INTERVAL", 0.01):
+                for _ in range(exoyone.FAILURE_THRESHOLD):
+                    exoyone._breaker.record_failure()
+                exoyone._start_probe()
+                assert not exoyone.available
+
+                async with asyncio.timeout(5):
+                    while not exoyone.available:
+                        await asyncio.sleep(0.01)
+
+            assert exoyone.availability.latency > 0
+            assert exoyone.availability.failures == 0
+            assert exoyone.state.mdnsName.startswith("exoyone")
+
+    async def test_recover_after_close(self):
+        """Test a device closed while unavailable probes again once reopened."""
+        exoyone = ExoyOne(host="127.0.0.1")
+        with patch.object(exoyone, "PROBE_INTERVAL", 0.01):
+            async with exoyone:
+                for _ in range(exoyone.FAILURE_THRESHOLD):
+                    exoyone._breaker.record_failure()
+                exoyone._start_probe()
+            assert not exoyone.available
+
+            async with exoyone:
+                with pytest.raises(ExoyOneUnavailableError):
+                    await exoyone.async_get_data()
+
+                async with asyncio.timeout(5):
+                    while not exoyone.available:
+                        await asyncio.sleep(0.01)
+                await exoyone.async_get_data()
@@ -0,0 +1,43 @@
+# type: ignore
+
+import pytest
+
+from exoyone import ExoyOne, ExoyOneValueError
+from exoyone.codec import CODECS, get_codec
+
+
+class TestExoyOneCodec:
+    """Test the JSON codecs."""
+
+    def test_default_codec(self):
+        """Test the fastest installed codec is the default."""
+        assert get_codec() is next(iter(CODECS.values()))
+        assert "json" in CODECS
+
+    @pytest.mark.parametrize("name", list(CODECS))
+    def test_round_trip(self, name):
+        """Test every installed codec round trips requests as bytes."""
+        codec = get_codec(name)
+        request = {"setHue": 20, "setShutdownTimer": {"hours": 1, "minutes": 5}}
+        encoded = codec.encode(request)
+        assert isinstance(encoded, bytes)
+        assert codec.decode(encoded) == request
+
+    def test_stdlib_encoding(self):
+        """Test the standard library codec keeps the original wire format."""
+        assert get_codec("json").encode({"setHue": 20}) == b'{"setHue": 20}'
+
+    def test_unknown_codec(self):
+        """Test requesting a codec that is not installed fails."""
+        with pytest.raises(ExoyOneValueError, match="not installed"):
+            get_codec("pickle")
+
+    @pytest.mark.usefixtures("run_moxyone")
+    @pytest.mark.parametrize("name", list(CODECS))
+    async def test_exoyone_codec(self, name):
+        """Test an ExoyOne reads and writes with every installed codec."""
+        async with ExoyOne(host="127.0.0.1", codec=name) as exoyone:
+            await exoyone.async_get_data()
+            new_hue = (exoyone.state.hue + 1) % 256
+            await exoyone.set_hue(new_hue)
+            assert exoyone.state.hue == new_hue
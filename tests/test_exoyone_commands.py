@@ -0,0 +1,62 @@
+# type: ignore
+
+import pytest
+
+from exoyone import ExoyOne
+from exoyone.codec import CODECS, get_codec
+from exoyone.commands import ExoyOneCommand, ExoyOneCommands, get_commands
+
+
+class TestExoyOneCommands:
+    """Test the ExoyOneCommands class."""
+
+    def test_constant_commands_are_cached(self):
+        """Test single-key commands are encoded once and reused."""
+        commands = ExoyOneCommands(get_codec("json"))
+        command = commands.command({"togglePower": 1})
+        assert command.payload == b'{"togglePower": 1}'
+        assert commands.command({"togglePower": 1}) is command
+        assert commands.command(command) is command
+
+        assert commands.command({"togglePower": True}).payload == (
+            b'{"togglePower": true}'
+        )
+        assert commands.command({"togglePower": 0}) is not command
+
+    @pytest.mark.parametrize("name", list(CODECS))
+    @pytest.mark.parametrize(
+        "request_",
+        [
+            {"setHue": 200},
+            {"setHue": 10, "setSaturation": 255, "setBrightness": 0},
+            {"setModPack": 3, "setEffect": 12},
+            {"setName": "Living Room"},
+            {"setShutdownTimer": {"hours": 1, "minutes": 5}},
+            {"poweredByPowerbank": False},
+        ],
+    )
+    def test_payloads_match_codec(self, name, request_):
+        """Test templated and cached payloads are identical to encoding."""
+        codec = get_codec(name)
+        command = ExoyOneCommands(codec).command(request_)
+        assert command == request_
+        assert command.payload == codec.encode(request_)
+
+    def test_command_is_immutable(self):
+        """Test a command cannot be changed after it has been encoded."""
+        command = get_commands(get_codec()).command({"setHue": 5})
+        with pytest.raises(TypeError):
+            command["setHue"] = 6
+        with pytest.raises(AttributeError):
+            command.payload = b"{}"
+
+    @pytest.mark.usefixtures("run_moxyone")
+    async def test_send_command(self):
+        """Test a pre-built command can be sent like any request."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            await exoyone.async_get_data()
+            hue = (exoyone.state.hue + 1) % 256
+            command = ExoyOneCommand({"setHue": hue}, b'{"setHue": %d}' % hue)
+            confirmation = await exoyone.async_set_data(command)
+            assert await confirmation
+            assert exoyone.state.hue == hue
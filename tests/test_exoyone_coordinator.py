@@ -0,0 +1,87 @@
+# type: ignore
+
+import asyncio
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from exoyone import ExoyOne, ExoyOneCoordinator
+from exoyone.models import ExoyOneValueError
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneCoordinator:
+    """Test the ExoyOneCoordinator class."""
+
+    async def test_change_listeners(self):
+        """Test listeners share one poll and only receive changed fields."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            coordinator = ExoyOneCoordinator(exoyone, interval=60)
+            callback = MagicMock()
+            queue = asyncio.Queue()
+            coordinator.add_listener(callback)
+            remove_queue = coordinator.add_listener(queue)
+
+            transport = exoyone._transport
+            with patch.object(
+                transport, "async_send", wraps=transport.async_send
+            ) as mock_send:
+                changes = await coordinator.async_refresh()
+                assert mock_send.call_count == 1
+
+            assert coordinator.last_update_success is True
+            assert changes["hue"] == (None, exoyone.state.hue)
+            callback.assert_called_once_with(changes)
+            assert queue.get_nowait() == changes
+
+            assert await coordinator.async_refresh() == {}
+            assert callback.call_count == 1
+
+            old_hue = exoyone.state.hue
+            new_hue = (old_hue + random.randint(1, 255)) % 256
+            remove_queue()
+            await exoyone.set_hue(new_hue)
+            changes = await coordinator.async_refresh()
+            assert changes == {"hue": (old_hue, new_hue)}
+            callback.assert_called_with(changes)
+            assert queue.empty()
+
+    async def test_polling(self):
+        """Test the coordinator polls in the background until stopped."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            changed = asyncio.Event()
+            async with ExoyOneCoordinator(exoyone, interval=60) as coordinator:
+                coordinator.add_listener(lambda changes: changed.set())
+                await asyncio.wait_for(changed.wait(), timeout=5)
+                assert coordinator.interval == 60
+                assert coordinator.exoyone is exoyone
+
+    async def test_unavailable(self):
+        """Test a device that stops replying is reported as unsuccessful."""
+        async with ExoyOne(host="192.0.2.1") as exoyone:
+            coordinator = ExoyOneCoordinator(exoyone)
+            with patch.object(exoyone, "TIMEOUT", 0.0):
+                assert await coordinator.async_refresh() == {}
+            assert coordinator.last_update_success is False
+
+    async def test_malformed_reply(self):
+        """Test a reply that cannot be read fails the poll but not polling."""
+        async with ExoyOne(host="127.0.0.1") as exoyone:
+            changed = asyncio.Event()
+            coordinator = ExoyOneCoordinator(exoyone, interval=0.01)
+            coordinator.add_listener(lambda changes: changed.set())
+            with patch(
+                "exoyone.exoyone.ExoyOneState.from_reply",
+                side_effect=ExoyOneValueError("Reply is missing hue"),
+            ):
+                assert await coordinator.async_refresh() == {}
+                assert coordinator.last_update_success is False
+
+                async with coordinator:
+                    await asyncio.sleep(0.05)
+                    assert not coordinator._poller.done()
+
+            async with coordinator:
+                await asyncio.wait_for(changed.wait(), timeout=5)
+            assert coordinator.last_update_success is True
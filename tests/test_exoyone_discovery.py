@@ -0,0 +1,42 @@
+# type: ignore
+
+from exoyone import ExoyOneDiscovery
+
+
+class TestExoyOneDiscovery:
+    """Test the ExoyOneDiscovery class."""
+
+    def test_index_tracks_address_changes(self):
+        """Test the index follows a device to a new address."""
+        discovery = ExoyOneDiscovery()
+        discovery.update("exoyone12345", "192.0.2.10")
+        exoyone = discovery.get_exoyone("exoyone12345")
+        assert exoyone.host == "192.0.2.10"
+        assert discovery.get_exoyone("exoyone12345") is exoyone
+
+        discovery.update("exoyone12345", "192.0.2.20")
+        assert discovery.devices["exoyone12345"].host == "192.0.2.20"
+        assert discovery.get_exoyone("exoyone12345").host == "192.0.2.20"
+
+        discovery.remove("exoyone12345")
+        assert discovery.devices == {}
+
+    def test_cache_round_trip(self, tmp_path):
+        """Test the index is saved to and loaded from the cache file."""
+        cache_path = tmp_path / "exoyone" / "devices.json"
+        discovery = ExoyOneDiscovery(cache_path=cache_path)
+        discovery.update("exoyone12345", "192.0.2.10")
+        discovery.update("exoyone67890", "192.0.2.11")
+        discovery.save()
+
+        cached = ExoyOneDiscovery(cache_path=cache_path)
+        cached.load()
+        assert cached.devices == discovery.devices
+
+    def test_unreadable_cache(self, tmp_path):
+        """Test an unreadable cache file is ignored."""
+        cache_path = tmp_path / "devices.json"
+        cache_path.write_text("not json", encoding="utf-8")
+        discovery = ExoyOneDiscovery(cache_path=cache_path)
+        discovery.load()
+        assert discovery.devices == {}
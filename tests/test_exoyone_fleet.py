@@ -0,0 +1,84 @@
+# type: ignore
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOne, ExoyOneFleet, ExoyOneState, ExoyOneUnavailableError
+from exoyone.models import ExoyOneTimeoutError
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneFleet:
+    """Test the ExoyOneFleet class."""
+
+    async def test_poll_all(self):
+        """Test polling every device over the shared endpoint."""
+        async with ExoyOneFleet(["127.0.0.1"]) as fleet:
+            assert len(fleet) == 1
+            assert fleet.hosts == ["127.0.0.1"]
+            assert fleet.add("127.0.0.1") is fleet["127.0.0.1"]
+
+            results = await fleet.poll_all()
+            assert isinstance(results["127.0.0.1"], ExoyOneState)
+            assert results["127.0.0.1"] is fleet["127.0.0.1"].state
+
+    async def test_apply_all(self):
+        """Test sending the same request to every device."""
+        async with ExoyOneFleet(["127.0.0.1"], concurrency=1) as fleet:
+            new_hue = random.randint(0, 255)
+            commands = fleet._commands
+            with patch.object(
+                commands, "command", wraps=commands.command
+            ) as mock_command:
+                results = await fleet.apply_all({"setHue": new_hue})
+            assert mock_command.call_count == 1
+            assert await results["127.0.0.1"] is True
+            assert all(exoyone.state.hue == new_hue for exoyone in fleet)
+
+    async def test_offline_device(self):
+        """Test a device that does not reply reports an error."""
+        async with ExoyOneFleet(["127.0.0.1", "192.0.2.1"]) as fleet:
+            with patch.object(ExoyOne, "TIMEOUT", 0.0):
+                results = await fleet.poll_all(hosts=["192.0.2.1"])
+            assert isinstance(results["192.0.2.1"], ExoyOneTimeoutError)
+
+            fleet.remove("192.0.2.1")
+            assert fleet.hosts == ["127.0.0.1"]
+
+    async def test_skip_offline(self):
+        """Test devices known to be offline can be left out."""
+        async with ExoyOneFleet(["127.0.0.1", "192.0.2.1"]) as fleet:
+            offline = fleet["192.0.2.1"]
+            for _ in range(offline.FAILURE_THRESHOLD):
+                offline._breaker.record_failure()
+            assert fleet.offline == ["192.0.2.1"]
+
+            results = await fleet.poll_all()
+            assert isinstance(results["192.0.2.1"], ExoyOneUnavailableError)
+
+            results = await fleet.poll_all(skip_offline=True)
+            assert list(results) == ["127.0.0.1"]
+            results = await fleet.apply_all({"setSpeed": 10}, skip_offline=True)
+            assert list(results) == ["127.0.0.1"]
+
+    async def test_poll_as_completed(self):
+        """Test streaming poll results with a deadline for stragglers."""
+        async with ExoyOneFleet(["127.0.0.1", "192.0.2.1"]) as fleet:
+            results = [result async for result in fleet.poll_as_completed(deadline=1.0)]
+
+        assert results[0][0] == "127.0.0.1"
+        assert isinstance(results[0][1], ExoyOneState)
+        assert results[1][0] == "192.0.2.1"
+        assert isinstance(results[1][1], ExoyOneTimeoutError)
+
+    async def test_poll_as_completed_quorum(self):
+        """Test streaming poll results stops waiting once a quorum replies."""
+        async with ExoyOneFleet(["192.0.2.1", "127.0.0.1"]) as fleet:
+            results = dict(
+                [result async for result in fleet.poll_as_completed(quorum=1)]
+            )
+
+        assert isinstance(results["127.0.0.1"], ExoyOneState)
+        assert isinstance(results["192.0.2.1"], ExoyOneTimeoutError)
@@ -0,0 +1,50 @@
+# type: ignore
+
+import time
+
+import pytest
+
+from exoyone import ExoyOne
+from exoyone.models import ExoyOneValueError
+from exoyone.ratelimit import TokenBucket
+
+
+class TestTokenBucket:
+    """Test the TokenBucket class."""
+
+    async def test_burst(self):
+        """Test a full bucket allows a burst without waiting."""
+        bucket = TokenBucket(rate=10, burst=3)
+        for _ in range(3):
+            assert bucket.delay() == 0
+            await bucket.async_acquire()
+        assert bucket.delay() > 0.09
+        assert bucket.stats.throttled == 0
+
+    async def test_rate(self):
+        """Test sends beyond the burst are held to the rate and measured."""
+        bucket = TokenBucket(rate=20, burst=1)
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.async_acquire()
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 0.14
+        assert bucket.stats.throttled == 3
+        assert 0.14 <= bucket.stats.throttled_time <= elapsed
+
+    async def test_wait_does_not_take(self):
+        """Test waiting for a token leaves it in the bucket."""
+        bucket = TokenBucket(rate=10, burst=1)
+        await bucket.async_wait()
+        await bucket.async_wait()
+        assert bucket.delay() == 0
+
+    def test_invalid(self):
+        """Test a bucket that could never hand out a token is rejected."""
+        with pytest.raises(ExoyOneValueError, match="Burst"):
+            TokenBucket(rate=5, burst=0)
+        with pytest.raises(ExoyOneValueError, match="Rate"):
+            TokenBucket(rate=0)
+        with pytest.raises(ExoyOneValueError, match="Burst"):
+            ExoyOne(host="127.0.0.1", rate_limit=5, burst=0)
@@ -0,0 +1,109 @@
+# type: ignore
+
+import asyncio
+import json
+import random
+import time
+
+from moxyone.moxyone import MoxyOneState
+
+from exoyone import ExoyOne
+from exoyone.rtt import RttEstimator
+from exoyone.transport import ExoyOneTransport
+
+REPLY = json.dumps(MoxyOneState(mdnsName="exoyone12345").as_dict()).encode()
+
+
+class SlowDevice(ExoyOneTransport):
+    """A transport whose device answers after a random, lognormal delay."""
+
+    def __init__(self, seed: int) -> None:
+        """Initialize the device."""
+        super().__init__("127.0.0.1", 8888)
+        self._random = random.Random(seed)
+        self._queue = asyncio.Queue()
+
+    @property
+    def is_open(self):
+        """Return True, as there is no endpoint to open."""
+        return True
+
+    async def async_open(self):
+        """Do nothing, as there is no endpoint to open."""
+
+    async def _async_send_datagram(self, payload, timeout):
+        """Queue the reply to arrive after a random delay."""
+        delay = self._random.lognormvariate(-6, 0.5)
+        asyncio.get_running_loop().call_later(delay, self._reply)
+
+    def _reply(self):
+        """Deliver a reply."""
+        if self._queue is not None:
+            self._queue.put_nowait((REPLY, time.monotonic()))
+
+    async def _async_reply_queue(self):
+        """Return the queue replies are delivered to."""
+        return self._queue
+
+
+class TestRttEstimator:
+    """Test the RttEstimator class."""
+
+    def test_initial_timeout(self):
+        """Test the initial timeout is used until a sample is taken."""
+        rtt = RttEstimator(initial=1.0, minimum=0.02, maximum=3.0)
+        assert rtt.srtt is None
+        assert rtt.timeout == 1.0
+
+    def test_samples(self):
+        """Test the timeout follows the smoothed RTT and variance."""
+        rtt = RttEstimator(initial=1.0, minimum=0.02, maximum=3.0)
+        rtt.sample(0.1)
+        assert rtt.srtt == 0.1
+        assert rtt.rttvar == 0.05
+        assert rtt.timeout == 0.1 + 4 * 0.05
+
+        for _ in range(50):
+            rtt.sample(0.005)
+        assert rtt.timeout == 0.02
+
+    def test_backoff(self):
+        """Test timeouts double the timeout up to the maximum."""
+        rtt = RttEstimator(initial=1.0, minimum=0.02, maximum=3.0)
+        rtt.backoff()
+        assert rtt.timeout == 2.0
+        rtt.backoff()
+        assert rtt.timeout == 3.0
+
+        rtt.sample(0.1)
+        assert rtt.timeout < 1.0
+
+    def test_percentile(self):
+        """Test percentiles of the recent latencies."""
+        rtt = RttEstimator(initial=1.0, minimum=0.02, maximum=3.0)
+        assert rtt.percentile(0.9) is None
+
+        for latency in range(1, 11):
+            rtt.observe(latency / 100)
+        assert rtt.observations == 10
+        assert rtt.samples == 0
+        assert rtt.percentile(0.9) == 0.09
+        assert rtt.percentile(0.5) == 0.05
+        assert rtt.percentile(1.0) == 0.1
+
+
+class TestExoyOneHedging:
+    """Test hedged reads on the ExoyOne class."""
+
+    async def test_hedge_rate(self):
+        """Test hedges fire on the slowest reads only, not more and more often."""
+        reads = 500
+        async with ExoyOne(
+            host="127.0.0.1", hedge=True, transport=SlowDevice(1)
+        ) as exoyone:
+            for _ in range(reads):
+                await exoyone.async_get_data()
+
+        rate = exoyone.hedge_stats.fired / reads
+        expected = 1 - exoyone.HEDGE_PERCENTILE
+        assert expected / 2 < rate < expected * 1.5
@@ -0,0 +1,74 @@
+# type: ignore
+
+import dataclasses
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOneFleet, ExoyOneScene
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneScene:
+    """Test the ExoyOneScene class."""
+
+    async def test_request_from(self, exoyone):
+        """Test only the settings that differ are requested."""
+        state = exoyone.state
+        scene = ExoyOneScene.capture("Show", state)
+        assert scene.request_from(state) == {}
+        assert len(scene.request_from(None)) == len(ExoyOneScene.FIELDS)
+
+        changed = dataclasses.replace(
+            state, hue=(state.hue + 1) % 256, musicSync=not state.musicSync
+        )
+        assert scene.request_from(changed) == {
+            "setHue": state.hue,
+            "toggleMusicSync": int(state.musicSync),
+        }
+
+        other_effect = dataclasses.replace(state, modeIndex=state.modeIndex + 1)
+        assert scene.request_from(other_effect) == {
+            "setModPack": state.currentModpack,
+            "setEffect": state.modeIndex,
+        }
+
+    async def test_restore(self, exoyone):
+        """Test restoring a scene sends one minimal request."""
+        scene = exoyone.capture_scene("Show")
+        await exoyone.set_hue((scene.settings["hue"] + 1) % 256)
+        await exoyone.set_speed(scene.settings["speed"] + 1)
+        await exoyone.set_name("Not part of the scene")
+
+        transport = exoyone._transport
+        with patch.object(
+            transport, "async_send", wraps=transport.async_send
+        ) as mock_send:
+            confirmation = await exoyone.async_restore_scene(scene)
+            assert await confirmation is True
+
+            payloads = [call.args[0] for call in mock_send.call_args_list]
+            assert exoyone._codec.decode(payloads[0]) == {
+                "setSpeed": scene.settings["speed"],
+                "setHue": scene.settings["hue"],
+            }
+            assert ExoyOneScene.capture("Now", exoyone.state) == dataclasses.replace(
+                scene, name="Now"
+            )
+            assert exoyone.state.userDefinedName == "Not part of the scene"
+
+            mock_send.reset_mock()
+            assert await (await exoyone.async_restore_scene(scene)) is True
+            assert mock_send.call_count == 0
+
+    async def test_restore_all(self):
+        """Test restoring a scene across a fleet."""
+        async with ExoyOneFleet(["127.0.0.1"]) as fleet:
+            state = await fleet["127.0.0.1"].async_get_state()
+            scene = ExoyOneScene.capture(
+                "Show",
+                dataclasses.replace(state, brightness=(state.brightness + 1) % 256),
+            )
+            results = await fleet.restore_all(scene)
+            assert await results["127.0.0.1"] is True
+            assert fleet["127.0.0.1"].state.brightness == scene.settings["brightness"]
@@ -0,0 +1,75 @@
+# type: ignore
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOneFleet, ExoyOneScheduler
+from exoyone.models import ExoyOneValueError
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneScheduler:
+    """Test the ExoyOneScheduler class."""
+
+    async def test_adaptive_intervals(self):
+        """Test unchanged devices back off and changed devices speed up."""
+        async with ExoyOneFleet(["127.0.0.1"]) as fleet:
+            scheduler = ExoyOneScheduler(
+                fleet, interval=0.1, min_interval=0.05, max_interval=0.2, jitter=0
+            )
+            changes = asyncio.Queue()
+            scheduler.coordinator("127.0.0.1").add_listener(changes)
+
+            async with scheduler:
+                first = await asyncio.wait_for(changes.get(), timeout=5)
+                assert first["hue"][0] is None
+
+                async with asyncio.timeout(5):
+                    while scheduler.interval("127.0.0.1") < 0.2:
+                        await asyncio.sleep(0.05)
+                assert scheduler.next_poll("127.0.0.1") <= 0.2
+
+                exoyone = fleet["127.0.0.1"]
+                await exoyone.set_hue((exoyone.state.hue + 1) % 256)
+                change = await asyncio.wait_for(changes.get(), timeout=5)
+                assert "hue" in change
+                assert scheduler.interval("127.0.0.1") == 0.05
+
+            assert scheduler.next_poll("127.0.0.1") is None
+
+    async def test_staggered_start(self):
+        """Test new devices are spread across the interval."""
+        fleet = ExoyOneFleet(["192.0.2.1", "192.0.2.2", "192.0.2.3", "192.0.2.4"])
+        scheduler = ExoyOneScheduler(fleet, interval=8.0, jitter=0)
+        scheduler._sync_hosts()
+        offsets = sorted(scheduler.next_poll(host) for host in fleet.hosts)
+        assert offsets == pytest.approx([0.0, 2.0, 4.0, 6.0], abs=0.1)
+
+        fleet.remove("192.0.2.4")
+        scheduler._sync_hosts()
+        assert scheduler.next_poll("192.0.2.4") is None
+
+    async def test_poll_error(self):
+        """Test a host is still polled after a poll raises."""
+        async with ExoyOneFleet(["127.0.0.1"]) as fleet:
+            scheduler = ExoyOneScheduler(fleet, interval=0.05, jitter=0)
+            coordinator = scheduler.coordinator("127.0.0.1")
+            refresh = coordinator.async_refresh
+            calls = 0
+
+            async def _refresh():
+                nonlocal calls
+                calls += 1
+                if calls == 1:
+                    raise ExoyOneValueError("Reply is missing hue")
+                return await refresh()
+
+            with patch.object(coordinator, "async_refresh", _refresh):
+                async with scheduler:
+                    async with asyncio.timeout(5):
+                        while calls < 3:
+                            await asyncio.sleep(0.01)
+                    assert scheduler.next_poll("127.0.0.1") is not None
+                    assert coordinator.last_update_success is True
@@ -0,0 +1,75 @@
+# type: ignore
+
+import asyncio
+
+import pytest
+
+from exoyone import ExoyOneException, ExoyOnePriority
+from exoyone.ratelimit import TokenBucket
+from exoyone.sendqueue import SendQueue
+
+
+class TestSendQueue:
+    """Test the SendQueue class."""
+
+    async def test_uncontended(self):
+        """Test sends go straight out when nothing is waiting."""
+        queue = SendQueue(TokenBucket(rate=1, burst=2))
+        assert await queue.async_turn(ExoyOnePriority.STREAM)
+        assert await queue.async_turn(ExoyOnePriority.NORMAL)
+        assert queue.stats.waited == 0
+
+    async def test_priority_order(self):
+        """Test control sends preempt normal sends, which preempt streaming."""
+        queue = SendQueue(TokenBucket(rate=50, burst=1))
+        await queue.async_turn(ExoyOnePriority.NORMAL)
+        order = []
+
+        async def _send(priority):
+            await queue.async_turn(priority)
+            order.append(priority)
+
+        tasks = [
+            asyncio.create_task(_send(priority))
+            for priority in (
+                ExoyOnePriority.STREAM,
+                ExoyOnePriority.NORMAL,
+                ExoyOnePriority.CONTROL,
+            )
+        ]
+        await asyncio.gather(*tasks)
+
+        assert order == [
+            ExoyOnePriority.CONTROL,
+            ExoyOnePriority.NORMAL,
+            ExoyOnePriority.STREAM,
+        ]
+        assert queue.stats.max_depth == 3
+        assert queue.stats.depth == 0
+        assert queue.stats.waited == 3
+        assert queue.stats.wait_time > 0
+
+    async def test_superseded(self):
+        """Test a queued streaming send is dropped when a newer one arrives."""
+        queue = SendQueue(TokenBucket(rate=50, burst=1))
+        await queue.async_turn(ExoyOnePriority.NORMAL)
+
+        first = asyncio.create_task(queue.async_turn(ExoyOnePriority.STREAM, "frame"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(queue.async_turn(ExoyOnePriority.STREAM, "frame"))
+
+        assert await first is False
+        assert await second is True
+        assert queue.stats.dropped == 1
+
+    async def test_close(self):
+        """Test closing the queue releases waiting senders."""
+        queue = SendQueue(TokenBucket(rate=1, burst=1))
+        await queue.async_turn(ExoyOnePriority.NORMAL)
+        waiting = asyncio.create_task(queue.async_turn(ExoyOnePriority.NORMAL))
+        await asyncio.sleep(0)
+        queue.close()
+        with pytest.raises(ExoyOneException, match="closed"):
+            await waiting
+        assert not waiting.cancelled()
+        assert queue.stats.depth == 0
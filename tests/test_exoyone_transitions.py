@@ -0,0 +1,78 @@
+# type: ignore
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOne
+from exoyone.models import ExoyOneValueError
+from exoyone.transitions import interpolate_hsb
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneTransition:
+    """Test colour transitions."""
+
+    def test_interpolate_hsb(self):
+        """Test colours are interpolated with hue taking the shorter way round."""
+        assert interpolate_hsb((0, 0, 0), (100, 200, 50), 0.5) == (50, 100, 25)
+        assert interpolate_hsb((250, 0, 0), (10, 0, 0), 0.5) == (2, 0, 0)
+        assert interpolate_hsb((10, 0, 0), (250, 0, 0), 0.5) == (2, 0, 0)
+        assert interpolate_hsb((0, 0, 0), (100, 200, 50), 1) == (100, 200, 50)
+
+    async def test_transition(self, exoyone):
+        """Test frames are streamed without reads and the end colour verified."""
+        await exoyone.set_color((0, 255, 0))
+        transport = exoyone._transport
+        with patch.object(
+            transport, "async_send", wraps=transport.async_send
+        ) as mock_send:
+            stats = await exoyone.async_transition(
+                hue=200, brightness=255, duration=0.3, fps=50
+            )
+            await exoyone.async_confirm_writes()
+
+        payloads = [call.args[0] for call in mock_send.call_args_list]
+        assert stats.sent > 2
+        assert not stats.superseded
+        assert payloads.count(b'{"getData": 1}') == 1
+        assert exoyone.state.hue == 200
+        assert exoyone.state.saturation == 255
+        assert exoyone.state.brightness == 255
+
+    async def test_dropped_frames(self):
+        """Test frames are dropped rather than queued when sending is slow."""
+        async with ExoyOne(host="127.0.0.1", verify_in_background=False) as exoyone:
+            await exoyone.set_color((0, 255, 0))
+            send_frame = exoyone.async_send_frame
+
+            async def _slow_send_frame(request):
+                await asyncio.sleep(0.05)
+                return await send_frame(request)
+
+            with patch.object(exoyone, "async_send_frame", _slow_send_frame):
+                stats = await exoyone.async_transition(
+                    brightness=255, duration=0.3, fps=100
+                )
+
+            assert stats.dropped > stats.sent
+            assert exoyone.state.brightness == 255
+
+    async def test_superseded(self, exoyone):
+        """Test a newer transition stops the one in progress."""
+        await exoyone.set_hue(0)
+        first = asyncio.create_task(exoyone.async_transition(hue=100, duration=1))
+        await asyncio.sleep(0.1)
+        assert exoyone.state.hue > 0
+        second = await exoyone.async_transition(hue=50, duration=0.1)
+
+        assert (await first).superseded
+        assert not second.superseded
+        assert exoyone.state.hue == 50
+
+    async def test_invalid_fps(self, exoyone):
+        """Test a frame rate that is not positive is rejected."""
+        for fps in (0, -1):
+            with pytest.raises(ExoyOneValueError, match="Frame rate"):
+                await exoyone.async_transition(hue=10, fps=fps)
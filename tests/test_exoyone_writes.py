@@ -0,0 +1,117 @@
+# type: ignore
+
+import asyncio
+import math
+from unittest.mock import patch
+
+import pytest
+
+from exoyone import ExoyOne
+from exoyone.writes import ExoyOneWrite
+
+
+@pytest.mark.usefixtures("run_moxyone")
+class TestExoyOneWrite:
+    """Test verifying writes setting by setting."""
+
+    async def test_check(self, exoyone):
+        """Test only settings that did not take are returned for resending."""
+        state = exoyone.state
+        write = ExoyOneWrite(
+            {
+                "setHue": state.hue,
+                "setSpeed": (state.speed + 1) % 256,
+                "restartInApMode": True,
+            },
+            asyncio.get_running_loop().create_future(),
+            0.0,
+        )
+        assert write.check(state) == {"setSpeed": (state.speed + 1) % 256}
+        assert write.results == {"setHue": True, "setSpeed": False}
+        assert write.fields == {"hue": state.hue, "speed": (state.speed + 1) % 256}
+
+        assert write.check(None) == {
+            "setHue": state.hue,
+            "setSpeed": (state.speed + 1) % 256,
+        }
+        assert write.results == {"setHue": False, "setSpeed": False}
+
+    async def test_check_effect(self, exoyone):
+        """Test the mode pack is resent with the effect that depends on it."""
+        state = exoyone.state
+        write = ExoyOneWrite(
+            {
+                "setModPack": state.currentModpack,
+                "setEffect": state.modeIndex + 1,
+                "setHue": state.hue,
+            },
+            asyncio.get_running_loop().create_future(),
+            0.0,
+        )
+        assert write.check(state) == {
+            "setModPack": state.currentModpack,
+            "setEffect": state.modeIndex + 1,
+        }
+
+    async def test_selective_resend(self):
+        """Test a setting that did not take is resent on its own."""
+        async with ExoyOne(host="127.0.0.1", verify_in_background=False) as exoyone:
+            await exoyone.async_get_data()
+            hue = (exoyone.state.hue + 1) % 256
+            speed = (exoyone.state.speed + 1) % 256
+            request = {"setHue": hue, "setSpeed": speed}
+
+            # Drop the speed from the first send, as if the device missed it.
+            commands = exoyone._commands
+            encode = commands.encode
+            dropped = iter([encode({"setHue": hue})])
+            transport = exoyone._transport
+            with (
+                patch.object(
+                    commands,
+                    "encode",
+                    side_effect=lambda request: next(dropped, None) or encode(request),
+                ),
+                patch.object(
+                    transport, "async_send", wraps=transport.async_send
+                ) as mock_send,
+            ):
+                write = await exoyone.async_write(request)
+                assert await write.confirmation is True
+
+            payloads = [call.args[0] for call in mock_send.call_args_list]
+            assert encode({"setSpeed": speed}) in payloads
+            assert encode(request) not in payloads
+            assert write.resends == 1
+            assert write.results == {"setHue": True, "setSpeed": True}
+            assert exoyone.state.speed == speed
+
+    async def test_resend_limit(self):
+        """Test a setting that never takes fails once the resends run out."""
+        async with ExoyOne(host="127.0.0.1", verify_in_background=False) as exoyone:
+            await exoyone.async_get_data()
+            hue = (exoyone.state.hue + 1) % 256
+            commands = exoyone._commands
+            with patch.object(commands, "encode", return_value=b'{"setSpeed": 1}'):
+                write = await exoyone.async_write({"setHue": hue})
+                assert await write.confirmation is False
+
+            assert write.resends == exoyone.MAX_RESENDS
+            assert write.results == {"setHue": False}
+
+    async def test_verify_timeout(self):
+        """Test a failed verification leaves resends in progress pending."""
+        async with ExoyOne(host="192.0.2.1", deadline=0.1) as exoyone:
+            exoyone.rtt.sample(0.001)
+            loop = asyncio.get_running_loop()
+            sent = ExoyOneWrite({"setHue": 1}, loop.create_future(), 0.0)
+            resending = ExoyOneWrite({"setSpeed": 1}, loop.create_future(), math.inf)
+            resending.resends = 1
+            exoyone._pending_writes = [sent, resending]
+
+            with patch.object(exoyone, "SETTLE_TIME", 0.0):
+                await exoyone._async_verify_writes()
+
+            assert sent.confirmation.result() is False
+            assert not resending.confirmation.done()
+            assert exoyone._pending_writes == [resending]